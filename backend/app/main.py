@@ -1,39 +1,63 @@
 """MindsDB UI Backend - FastAPI Application"""
+import logging
 import os
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from .routers import datasources, query
+from .services.mindsdb_service import mindsdb_service
+from .services.neo4j_service import neo4j_service
+from .services.schema_introspection import adapter_pool
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서비스 시작 시 Neo4j 드라이버 초기화 및 제약조건 생성, 종료 시 정리"""
+    try:
+        await neo4j_service.connect()
+        await neo4j_service.ensure_constraints()
+    except Exception as e:
+        logger.warning(f"Could not initialize Neo4j: {e}")
+    
+    yield
+    
+    await adapter_pool.close()
+    await mindsdb_service.aclose()
+    await neo4j_service.close()
+
 
 app = FastAPI(
     title="MindsDB UI API",
     description="Backend API for MindsDB Data Source Management UI",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware for Vue.js frontend
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173", 
-        "http://127.0.0.1:5173", 
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        "http://localhost:3003",
-        "http://127.0.0.1:3003",
-        "http://localhost:8080",
-        "http://127.0.0.1:8080",
-        "*"  # Allow all origins for development
-    ],
+    # localhost/127.0.0.1의 개발 서버 포트만 허용 (정규식은 한 번만 컴파일됨)
+    # "*"는 allow_credentials=True와 함께 쓸 수 없으므로 사용하지 않음
+    allow_origin_regex=r"^https?://(localhost|127\.0\.0\.1)(:(3000|3003|5173|8080))?$",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# 큰 JSON 응답(데이터소스/테이블 목록 등) 압축
+# 리버스 프록시에서 이미 압축한다면 제거할 것
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(datasources.router, prefix="/api")
 app.include_router(query.router, prefix="/api")
@@ -1,10 +1,13 @@
 """Data Sources Router - Neo4j & MindsDB 통합"""
-import json
+import asyncio
+import hashlib
 import logging
 import os
-from fastapi import APIRouter, HTTPException, Query, Body
-from fastapi.responses import StreamingResponse
-from typing import List, Optional, Dict, Any
+import time
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Body, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import asdict
 from pydantic import BaseModel
 from ..schemas.datasource import (
@@ -21,7 +24,8 @@ from ..services.neo4j_service import neo4j_service
 from ..services.schema_introspection import (
     SchemaIntrospectionService,
     AdapterFactory,
-    ExtractionProgress
+    ExtractionProgress,
+    adapter_pool
 )
 
 logger = logging.getLogger(__name__)
@@ -29,8 +33,12 @@ logger = logging.getLogger(__name__)
 # 환경변수: localhost를 MindsDB용 Docker 내부 호스트로 대치
 # 예: MINDSDB_REPLACE_LOCALHOST=host.docker.internal
 MINDSDB_REPLACE_LOCALHOST = os.getenv("MINDSDB_REPLACE_LOCALHOST", "host.docker.internal")
+_LOCALHOST_ALIASES = frozenset(("localhost", "127.0.0.1"))
 router = APIRouter(prefix="/datasources", tags=["Data Sources"])
 
+# 메타데이터 추출 SSE 진행 이벤트 최소 전송 간격 (초)
+_SSE_MIN_INTERVAL = 0.05
+
 
 class ExtractMetadataRequest(BaseModel):
     """메타데이터 추출 요청 모델"""
@@ -47,54 +55,205 @@ class TestConnectionRequest(BaseModel):
     password: Optional[str] = None
     database: Optional[str] = None
 
-# 스키마 인트로스펙션 서비스 초기화
-introspection_service = SchemaIntrospectionService(neo4j_service)
+# 스키마 인트로스펙션 서비스 (추출 요청이 처음 들어올 때 생성)
+_introspection_service: Optional[SchemaIntrospectionService] = None
 
 
-@router.get("/types")
-async def get_datasource_types():
-    """Get all supported data source types with their configuration"""
-    types = []
-    for source_type, config in DATASOURCE_CONFIGS.items():
-        types.append({
+def get_introspection_service() -> SchemaIntrospectionService:
+    """스키마 인트로스펙션 서비스 싱글톤 반환 (lazy 초기화)"""
+    global _introspection_service
+    if _introspection_service is None:
+        _introspection_service = SchemaIntrospectionService(neo4j_service)
+    return _introspection_service
+
+
+async def _invalidate_schema_cache(name: str, bump_version: bool = True) -> None:
+    """
+    연결 정보가 바뀐 DataSource의 추출 캐시 무효화
+    
+    이 프로세스의 캐시를 비우고, schema_version을 올려 다른 워커의 캐시도 다음 추출 시 무효가 되게 합니다.
+    """
+    if _introspection_service is not None:
+        _introspection_service.invalidate(name)
+    if bump_version:
+        await neo4j_service.bump_schema_version(name)
+
+
+# fire-and-forget 태스크 참조 보관 (GC로 중간에 취소되지 않도록)
+_background_tasks: set = set()
+
+
+def _on_background_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.warning(f"Background task failed: {task.exception()}")
+
+
+def _run_in_background(coro) -> asyncio.Task:
+    """요청 처리 경로를 막지 않도록 코루틴을 백그라운드 태스크로 실행"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_done)
+    return task
+
+
+def _encode_with_etag(payload: Any) -> Tuple[str, bytes]:
+    """(본문 해시 ETag, JSON 본문)"""
+    body = orjson.dumps(payload)
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"', body
+
+
+def _etag_response(request: Request, payload: Any = None, encoded: Tuple[str, bytes] = None) -> Response:
+    """
+    본문 해시로 ETag를 붙여 응답 - If-None-Match가 같으면 본문 없이 304 반환 (UI 폴링용)
+    
+    encoded: 미리 만들어 둔 (ETag, 본문) 쌍 (MindsDB 메타데이터 캐시와 함께 보관된 것을 재사용)
+    """
+    etag, body = encoded if encoded is not None else _encode_with_etag(payload)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+# 프로세스 수명 동안 변하지 않는 응답은 import 시점에 한 번만 직렬화
+_TYPES_PAYLOAD = {
+    "types": [
+        {
             "type": source_type.value,
             "display_name": config["display_name"],
             "icon": config["icon"],
             "fields": config["fields"]
-        })
-    return {"types": types}
+        }
+        for source_type, config in DATASOURCE_CONFIGS.items()
+    ]
+}
+_TYPES_JSON = orjson.dumps(_TYPES_PAYLOAD)
+_ENGINES_JSON = orjson.dumps({"engines": AdapterFactory.supported_engines()})
+
+
+@router.get("/types")
+async def get_datasource_types():
+    """Get all supported data source types with their configuration"""
+    return Response(content=_TYPES_JSON, media_type="application/json")
 
 
 @router.get("/supported-engines")
 async def get_supported_engines():
     """Get list of engines that support metadata extraction"""
-    return {"engines": AdapterFactory.supported_engines()}
+    return Response(content=_ENGINES_JSON, media_type="application/json")
 
 
-@router.get("", response_model=DataSourceList)
-async def list_datasources(source: str = Query("neo4j", description="Data source: 'neo4j' or 'mindsdb'")):
-    """Get list of all registered data sources"""
+@router.get("", responses={200: {"model": DataSourceList}})
+async def list_datasources(
+    request: Request,
+    source: str = Query("neo4j", description="Data source: 'neo4j' or 'mindsdb'")
+):
+    """Get list of all registered data sources
+    
+    내부 저장소에서 이미 형태가 갖춰진 데이터이므로 행 단위 Pydantic 검증 없이 바로 직렬화합니다.
+    """
     if source == "mindsdb":
         # MindsDB에서 데이터 소스 조회
-        databases = await mindsdb_service.get_databases()
-        return {"datasources": databases}
+        encoded = await mindsdb_service.cached_encoding(
+            ("databases",),
+            mindsdb_service.get_databases,
+            lambda databases: _encode_with_etag({"datasources": databases})
+        )
+        return _etag_response(request, encoded=encoded)
     else:
-        # Neo4j에서 DataSource 노드 조회
+        # Neo4j에서 DataSource 노드 조회 (응답 형태는 Cypher에서 바로 projection)
         datasources = await neo4j_service.get_datasources()
-        return {"datasources": [
-            {
-                "name": ds["name"],
-                "engine": ds.get("engine", "unknown"),
-                "tables": [],
-                "display_name": ds.get("display_name"),
-                "host": ds.get("host"),
-                "port": ds.get("port"),
-                "database": ds.get("database"),
-                "user": ds.get("user"),
-                "schema_count": ds.get("schema_count", 0)
-            }
-            for ds in datasources
-        ]}
+        return _etag_response(request, {"datasources": datasources})
+
+
+def _resolve_health_status(result: Dict[str, Any], mindsdb_error: Optional[str] = None) -> Dict[str, Any]:
+    """DB/MindsDB 연결 여부로 최종 상태 결정 (mindsdb_error: MindsDB 등록 여부 확인 자체가 실패한 경우)"""
+    if mindsdb_error:
+        # MindsDB 장애는 '미등록'과 구분해서 보고
+        result["status"] = "partial" if result["db_connected"] else "disconnected"
+        db_message = "DB 연결됨" if result["db_connected"] else (result["message"] or "DB 연결 실패")
+        result["message"] = f"{db_message}, MindsDB 확인 실패: {mindsdb_error}"
+    elif result["db_connected"] and result["mindsdb_connected"]:
+        result["status"] = "healthy"
+        result["message"] = "DB 및 MindsDB 연결 정상"
+    elif result["db_connected"]:
+        result["status"] = "partial"
+        result["message"] = "DB 연결됨, MindsDB 미등록"
+    elif result["mindsdb_connected"]:
+        result["status"] = "partial"
+        result["message"] = "MindsDB 등록됨, DB 연결 실패"
+    else:
+        result["status"] = "disconnected"
+        if not result["message"]:
+            result["message"] = "연결 없음"
+    
+    return result
+
+
+async def _probe_db(engine: str, connection: Dict[str, Any]) -> tuple[bool, str]:
+    """실제 DB 연결 테스트 - (연결 여부, 메시지) 반환"""
+    if engine not in AdapterFactory.supported_engine_set():
+        return False, f"지원하지 않는 엔진: {engine}"
+    
+    async with adapter_pool.acquire(engine, connection) as adapter:
+        if not adapter:
+            return False, ""
+        await adapter.ping()
+    return True, "데이터베이스 연결 정상"
+
+
+async def _probe_mindsdb(name: str) -> bool:
+    """MindsDB 등록 여부 확인 (전체 목록 대신 단일 행 조회)"""
+    return await mindsdb_service.database_exists(name)
+
+
+async def _probe_one(
+    connection: Dict[str, Any],
+    mindsdb_names: set,
+    sem: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """일괄 헬스체크용 단일 데이터소스 확인 (MindsDB 목록은 미리 조회된 것 사용)"""
+    name = connection["name"]
+    result = {
+        "name": name,
+        "status": "unknown",
+        "message": "",
+        "db_connected": False,
+        "mindsdb_connected": name in mindsdb_names
+    }
+    
+    async with sem:
+        try:
+            result["db_connected"], result["message"] = await _probe_db(
+                (connection.get("engine") or "").lower(), connection
+            )
+        except Exception as e:
+            result["message"] = f"연결 실패: {str(e)}"
+    
+    return _resolve_health_status(result)
+
+
+# 일괄 헬스체크 경로 - "/{name}" 경로와 겹치지 않도록 데이터소스 이름으로 쓸 수 없는 "-" 세그먼트 사용
+_RESERVED_NAME = "-"
+
+
+@router.get(f"/{_RESERVED_NAME}/health")
+async def check_health_all():
+    """모든 데이터소스 연결 상태 일괄 확인 (헬스체크)"""
+    connections = await neo4j_service.get_all_connection_params()
+    
+    try:
+        mindsdb_names = {db["name"] for db in await mindsdb_service.get_databases()}
+    except Exception as e:
+        logger.warning(f"MindsDB 연결 확인 실패: {e}")
+        mindsdb_names = set()
+    
+    sem = asyncio.Semaphore(16)
+    results = await asyncio.gather(*[
+        _probe_one(connection, mindsdb_names, sem) for connection in connections
+    ])
+    return {"results": results}
 
 
 @router.get("/{name}/health")
@@ -120,48 +279,31 @@ async def check_health(name: str):
         "mindsdb_connected": False
     }
     
-    # 1. 실제 DB 연결 테스트
-    if engine in AdapterFactory.supported_engines():
-        try:
-            adapter = AdapterFactory.get_adapter(engine, connection)
-            if adapter:
-                await adapter.connect()
-                await adapter.disconnect()
-                result["db_connected"] = True
-                result["status"] = "healthy"
-                result["message"] = "데이터베이스 연결 정상"
-        except Exception as e:
-            result["db_connected"] = False
-            result["status"] = "disconnected"
-            result["message"] = f"연결 실패: {str(e)}"
+    # 1. 실제 DB 연결 테스트 / 2. MindsDB 등록 여부 확인 - 서로 독립적이므로 동시 실행
+    db_res, mdb_res = await asyncio.gather(
+        _probe_db(engine, connection),
+        _probe_mindsdb(name),
+        return_exceptions=True
+    )
+    
+    if isinstance(db_res, Exception):
+        result["db_connected"] = False
+        result["status"] = "disconnected"
+        result["message"] = f"연결 실패: {str(db_res)}"
     else:
-        result["message"] = f"지원하지 않는 엔진: {engine}"
+        result["db_connected"], result["message"] = db_res
+        if result["db_connected"]:
+            result["status"] = "healthy"
     
-    # 2. MindsDB 등록 여부 확인 (데이터베이스 목록에서 확인)
-    try:
-        mindsdb_databases = await mindsdb_service.get_databases()
-        mindsdb_names = [db["name"] for db in mindsdb_databases]
-        result["mindsdb_connected"] = name in mindsdb_names
-    except Exception as e:
-        logger.warning(f"MindsDB 연결 확인 실패: {e}")
+    mindsdb_error = None
+    if isinstance(mdb_res, Exception):
+        logger.warning(f"MindsDB 연결 확인 실패: {mdb_res}")
         result["mindsdb_connected"] = False
-    
-    # 최종 상태 결정
-    if result["db_connected"] and result["mindsdb_connected"]:
-        result["status"] = "healthy"
-        result["message"] = "DB 및 MindsDB 연결 정상"
-    elif result["db_connected"]:
-        result["status"] = "partial"
-        result["message"] = "DB 연결됨, MindsDB 미등록"
-    elif result["mindsdb_connected"]:
-        result["status"] = "partial"
-        result["message"] = "MindsDB 등록됨, DB 연결 실패"
+        mindsdb_error = str(mdb_res)
     else:
-        result["status"] = "disconnected"
-        if not result["message"]:
-            result["message"] = "연결 없음"
+        result["mindsdb_connected"] = mdb_res
     
-    return result
+    return _resolve_health_status(result, mindsdb_error)
 
 
 @router.post("", response_model=DataSourceResponse)
@@ -175,6 +317,9 @@ async def create_datasource(
     1. Neo4j에 메타데이터 저장 (비밀번호 포함)
     2. MindsDB에 등록 (연결 검증은 MindsDB가 수행)
     """
+    if datasource.name == _RESERVED_NAME:
+        raise HTTPException(status_code=400, detail=f"'{_RESERVED_NAME}' is reserved and cannot be used as a data source name")
+    
     mindsdb_error = None
     
     # 1. Neo4j에 DataSource 노드 등록 (비밀번호 포함)
@@ -187,6 +332,8 @@ async def create_datasource(
         )
         if not neo4j_result:
             raise HTTPException(status_code=400, detail="Failed to create DataSource in Neo4j")
+        # 같은 이름으로 다시 등록한 경우 이전 연결 기준의 추출 캐시를 쓰지 않도록
+        await _invalidate_schema_cache(datasource.name)
         
         logger.info(f"Neo4j DataSource created: {datasource.name}")
     
@@ -202,14 +349,14 @@ async def create_datasource(
             logger.info(f"Drop result: {drop_result}")
             
             # MindsDB용 파라미터 준비
-            mindsdb_params = datasource.parameters.copy()
-            
-            # localhost를 Docker 내부 호스트로 자동 대치
+            # localhost를 Docker 내부 호스트로 자동 대치 (대치가 필요할 때만 복사)
             # MindsDB는 Docker 컨테이너에서 실행되므로 localhost가 다른 의미를 가짐
-            host = mindsdb_params.get("host", "")
-            if host in ["localhost", "127.0.0.1"] and MINDSDB_REPLACE_LOCALHOST:
-                mindsdb_params["host"] = MINDSDB_REPLACE_LOCALHOST
+            host = datasource.parameters.get("host", "")
+            if host in _LOCALHOST_ALIASES and MINDSDB_REPLACE_LOCALHOST:
+                mindsdb_params = {**datasource.parameters, "host": MINDSDB_REPLACE_LOCALHOST}
                 logger.info(f"Replacing localhost with {MINDSDB_REPLACE_LOCALHOST} for MindsDB")
+            else:
+                mindsdb_params = datasource.parameters
             
             logger.info(f"MindsDB registration with host: {mindsdb_params.get('host')}")
             
@@ -273,10 +420,21 @@ async def delete_datasource(
     """Delete a data source connection"""
     deleted = False
     
-    if delete_from in ["neo4j", "both"]:
+    if delete_from == "both":
+        # Neo4j / MindsDB 삭제는 서로 독립적이므로 동시 실행
+        neo4j_ok, result = await asyncio.gather(
+            neo4j_service.delete_datasource(name),
+            mindsdb_service.drop_database(name),
+            return_exceptions=True
+        )
+        if isinstance(neo4j_ok, Exception):
+            raise neo4j_ok
+        if isinstance(result, Exception):
+            raise result
+        deleted = neo4j_ok or result["type"] != "error"
+    elif delete_from == "neo4j":
         deleted = await neo4j_service.delete_datasource(name)
-    
-    if delete_from in ["mindsdb", "both"]:
+    elif delete_from == "mindsdb":
         result = await mindsdb_service.drop_database(name)
         if result["type"] != "error":
             deleted = True
@@ -284,6 +442,9 @@ async def delete_datasource(
     if not deleted:
         raise HTTPException(status_code=400, detail=f"Failed to delete DataSource '{name}'")
     
+    # Neo4j 노드는 삭제되었으므로 버전 증가 없이 로컬 캐시만 폐기
+    await _invalidate_schema_cache(name, bump_version=False)
+    
     return {"message": f"Data source '{name}' deleted successfully"}
 
 
@@ -300,7 +461,7 @@ class UpdateConnectionRequest(BaseModel):
 async def update_connection(name: str, request: UpdateConnectionRequest):
     """데이터소스 연결 정보 업데이트 (비밀번호 포함)"""
     # 업데이트할 파라미터만 추출
-    params = {k: v for k, v in request.model_dump().items() if v is not None}
+    params = request.model_dump(exclude_none=True)
     
     if not params:
         raise HTTPException(status_code=400, detail="No parameters to update")
@@ -308,15 +469,16 @@ async def update_connection(name: str, request: UpdateConnectionRequest):
     result = await neo4j_service.update_datasource(name, parameters=params)
     if not result:
         raise HTTPException(status_code=404, detail=f"DataSource '{name}' not found")
+    await _invalidate_schema_cache(name)
     
     return {"message": "Connection info updated", "datasource": result}
 
 
 @router.get("/{name}/schemas")
-async def get_schemas(name: str):
+async def get_schemas(request: Request, name: str):
     """Get list of schemas in a data source (Neo4j only)"""
     schemas = await neo4j_service.get_schemas(name)
-    return {"schemas": schemas}
+    return _etag_response(request, {"schemas": schemas})
 
 
 @router.get("/{name}/connection")
@@ -329,14 +491,18 @@ async def get_connection_params(name: str):
 
 
 @router.get("/{name}/tables")
-async def get_tables(name: str, schema: str = Query(None), source: str = Query("neo4j")):
+async def get_tables(request: Request, name: str, schema: str = Query(None), source: str = Query("neo4j")):
     """Get list of tables in a data source"""
     if source == "neo4j":
         tables = await neo4j_service.get_tables(name, schema)
-        return {"tables": tables}
+        return _etag_response(request, {"tables": tables})
     else:
-        tables = await mindsdb_service.get_tables(name)
-        return {"tables": [{"name": t} for t in tables]}
+        encoded = await mindsdb_service.cached_encoding(
+            ("tables", name),
+            lambda: mindsdb_service.get_tables(name),
+            lambda tables: _encode_with_etag({"tables": [{"name": t} for t in tables]})
+        )
+        return _etag_response(request, encoded=encoded)
 
 
 @router.get("/{name}/tables/{table}/schema")
@@ -354,11 +520,12 @@ async def get_sample_data(name: str, table: str, limit: int = 10, source: str =
     if result["type"] == "error":
         raise HTTPException(status_code=400, detail=result["error"])
     
-    return {
+    # 행 데이터는 MindsDB에서 받은 그대로이므로 jsonable_encoder 순회 없이 바로 직렬화
+    return ORJSONResponse({
         "columns": result["columns"],
         "data": result["data"],
         "total_rows": result["row_count"]
-    }
+    })
 
 
 @router.post("/test-connection")
@@ -370,7 +537,7 @@ async def test_connection_params(request: TestConnectionRequest):
     """
     engine = request.engine.lower()
     
-    if engine not in AdapterFactory.supported_engines():
+    if engine not in AdapterFactory.supported_engine_set():
         # 지원하지 않는 엔진은 MindsDB에 위임할 수밖에 없으므로 간단 응답
         return {
             "success": True,
@@ -402,18 +569,19 @@ async def test_connection_params(request: TestConnectionRequest):
 async def test_connection(name: str, source: str = Query("mindsdb")):
     """기존 데이터소스 연결 테스트 (등록된 데이터소스용)"""
     if source == "mindsdb":
-        tables = await mindsdb_service.get_tables(name)
+        # 전체 테이블 목록 대신 한 행만 조회하여 연결 여부 확인 (이름은 서비스에서 식별자 검증)
+        probe = await mindsdb_service.probe_database(name)
         
-        if tables:
-            return {"success": True, "message": f"Connected successfully. Found {len(tables)} tables."}
+        if probe["type"] != "error":
+            return {"success": True, "message": "Connected successfully."}
         
-        # 테이블이 없으면 MindsDB 데이터베이스 목록에서 등록 여부 확인
+        # 조회 실패 시 MindsDB 데이터베이스 목록에서 등록 여부를 확인해 실패 원인 구분
         databases = await mindsdb_service.get_databases()
-        db_names = [db["name"] for db in databases]
+        db_names = {db["name"] for db in databases}
         if name in db_names:
-            return {"success": True, "message": "Connected successfully. No tables found yet."}
+            return {"success": False, "message": f"Registered in MindsDB, but connection failed: {probe['error']}"}
         
-        return {"success": False, "message": f"Database '{name}' is not registered in MindsDB"}
+        return {"success": False, "message": f"Database '{name}' is not registered in MindsDB: {probe['error']}"}
     else:
         # Neo4j에서는 DataSource 노드 존재 여부 확인
         datasource = await neo4j_service.get_datasource(name)
@@ -430,7 +598,8 @@ async def test_connection(name: str, source: str = Query("mindsdb")):
 @router.post("/{name}/extract-metadata")
 async def extract_metadata(
     name: str,
-    request: ExtractMetadataRequest = None
+    request: ExtractMetadataRequest = None,
+    force: bool = Query(False, description="캐시를 무시하고 다시 추출")
 ):
     """
     데이터 소스에서 메타데이터 추출 및 Neo4j에 저장 (스트리밍)
@@ -439,6 +608,7 @@ async def extract_metadata(
     테이블, 컬럼, 외래키 정보를 추출하여 Neo4j에 저장합니다.
     
     패스워드가 요청에 포함되면 해당 패스워드를 사용하고 Neo4j에도 업데이트합니다.
+    마지막 추출 이후 schema_version과 소스 DB의 카탈로그(DDL) 지문이 같으면 캐시된 결과를 반환합니다 (force=true로 우회).
     Progress 이벤트를 SSE(Server-Sent Events)로 스트리밍합니다.
     """
     # 저장된 연결 정보 조회
@@ -449,40 +619,45 @@ async def extract_metadata(
     # 패스워드가 요청에 있으면 오버라이드하고 Neo4j에 업데이트
     if request and request.password:
         connection["password"] = request.password
-        # Neo4j에 패스워드 업데이트 (upsert)
-        await neo4j_service.update_datasource(name, parameters={"password": request.password})
-        logger.info(f"Password updated for datasource: {name}")
+        # Neo4j에 패스워드 업데이트 (upsert) - 추출은 메모리의 값을 쓰므로 백그라운드로 저장
+        _run_in_background(neo4j_service.update_datasource(name, parameters={"password": request.password}))
+        logger.info(f"Password update scheduled for datasource: {name}")
     
     engine = connection.get("engine", "postgres")
     schemas = request.schemas if request else None
     
     # 지원하는 엔진인지 확인
-    if engine.lower() not in AdapterFactory.supported_engines():
+    if engine.lower() not in AdapterFactory.supported_engine_set():
         raise HTTPException(
             status_code=400, 
             detail=f"Unsupported engine: {engine}. Supported: {AdapterFactory.supported_engines()}"
         )
     
     async def generate_events():
-        """SSE 이벤트 생성"""
+        """SSE 이벤트 생성 (phase 변경/오류는 즉시, 그 외는 최대 20Hz로 합쳐서 전송)"""
+        last_phase = None
+        last_emit = 0.0
+        pending = None
         try:
-            async for progress in introspection_service.extract_and_store(
+            async for progress in get_introspection_service().extract_and_store(
                 datasource_name=name,
                 engine=engine,
                 connection_params=connection,
-                schemas=schemas
+                schemas=schemas,
+                force=force
             ):
-                event_data = {
-                    "phase": progress.phase,
-                    "message": progress.message,
-                    "progress": progress.progress,
-                    "total_schemas": progress.total_schemas,
-                    "processed_schemas": progress.processed_schemas,
-                    "total_tables": progress.total_tables,
-                    "processed_tables": progress.processed_tables,
-                    "error": progress.error
-                }
-                yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+                now = time.monotonic()
+                if progress.phase != last_phase or progress.error or now - last_emit >= _SSE_MIN_INTERVAL:
+                    # ExtractionProgress는 dataclass이므로 orjson이 중간 dict 없이 바로 직렬화
+                    yield b"data: " + orjson.dumps(progress) + b"\n\n"
+                    last_phase = progress.phase
+                    last_emit = now
+                    pending = None
+                else:
+                    pending = progress
+            
+            if pending:
+                yield b"data: " + orjson.dumps(pending) + b"\n\n"
         except Exception as e:
             logger.error(f"Extraction failed: {e}")
             error_event = {
@@ -491,7 +666,7 @@ async def extract_metadata(
                 "progress": 0,
                 "error": str(e)
             }
-            yield f"data: {json.dumps(error_event, ensure_ascii=False)}\n\n"
+            yield b"data: " + orjson.dumps(error_event) + b"\n\n"
     
     return StreamingResponse(
         generate_events(),
@@ -507,7 +682,8 @@ async def extract_metadata(
 @router.post("/{name}/extract-metadata-sync")
 async def extract_metadata_sync(
     name: str,
-    request: ExtractMetadataRequest = None
+    request: ExtractMetadataRequest = None,
+    force: bool = Query(False, description="캐시를 무시하고 다시 추출")
 ):
     """
     데이터 소스에서 메타데이터 추출 (동기식, non-streaming)
@@ -524,60 +700,53 @@ async def extract_metadata_sync(
     # 패스워드가 요청에 있으면 오버라이드하고 Neo4j에 업데이트
     if request and request.password:
         connection["password"] = request.password
-        # Neo4j에 패스워드 업데이트 (upsert)
-        await neo4j_service.update_datasource(name, parameters={"password": request.password})
-        logger.info(f"Password updated for datasource: {name}")
+        # Neo4j에 패스워드 업데이트 (upsert) - 추출은 메모리의 값을 쓰므로 백그라운드로 저장
+        _run_in_background(neo4j_service.update_datasource(name, parameters={"password": request.password}))
+        logger.info(f"Password update scheduled for datasource: {name}")
     
     engine = connection.get("engine", "postgres")
     schemas = request.schemas if request else None
     
-    if engine.lower() not in AdapterFactory.supported_engines():
+    if engine.lower() not in AdapterFactory.supported_engine_set():
         raise HTTPException(
             status_code=400, 
             detail=f"Unsupported engine: {engine}"
         )
     
-    last_progress = None
+    # 최종 값만 필요하므로 진행 객체를 보관하지 않고 스칼라만 갱신
+    phase = ""
+    message = ""
+    total_schemas = total_tables = 0
+    received = False
+    err = None
     try:
-        async for progress in introspection_service.extract_and_store(
+        async for progress in get_introspection_service().extract_and_store(
             datasource_name=name,
             engine=engine,
             connection_params=connection,
-            schemas=schemas
+            schemas=schemas,
+            force=force
         ):
-            last_progress = progress
             if progress.error:
-                raise HTTPException(status_code=500, detail=progress.error)
-    except HTTPException:
-        raise
+                err = progress.error
+                break
+            received = True
+            phase = progress.phase
+            message = progress.message
+            total_schemas = progress.total_schemas
+            total_tables = progress.total_tables
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-    if last_progress:
+    if err:
+        raise HTTPException(status_code=500, detail=err)
+    
+    if received:
         return {
-            "success": last_progress.phase == "complete",
-            "message": last_progress.message,
-            "schemas": last_progress.total_schemas,
-            "tables": last_progress.total_tables
+            "success": phase == "complete",
+            "message": message,
+            "schemas": total_schemas,
+            "tables": total_tables
         }
     
     return {"success": False, "message": "No progress data"}
-
-
-# ========================================
-# Startup/Shutdown Hooks
-# ========================================
-
-@router.on_event("startup")
-async def startup():
-    """서비스 시작 시 Neo4j 제약조건 생성"""
-    try:
-        await neo4j_service.ensure_constraints()
-    except Exception as e:
-        print(f"Warning: Could not create Neo4j constraints: {e}")
-
-
-@router.on_event("shutdown")
-async def shutdown():
-    """서비스 종료 시 Neo4j 드라이버 정리"""
-    await neo4j_service.close()
@@ -1,68 +1,184 @@
 """Query Router"""
-from fastapi import APIRouter, HTTPException
+import logging
+import msgspec
+import orjson
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from ..schemas.query import (
     QueryRequest, 
     QueryResponse, 
     MaterializedTableCreate,
     ModelInfo,
     JobInfo,
+    MaterializedViewInfo,
     KnowledgeBaseInfo,
     MindsDBStatus
 )
 from ..services.mindsdb_service import mindsdb_service
-from typing import List
+from ..services.neo4j_service import neo4j_service
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/query", tags=["Query"])
 
+_READ_ONLY_PREFIXES = ("SELECT", "SHOW", "DESCRIBE", "DESC ", "EXPLAIN")
+
+
+def _encode(obj: Any) -> Response:
+    """msgspec 구조체를 그대로 JSON 응답으로 인코딩 (Pydantic 재검증 생략)"""
+    return Response(content=msgspec.json.encode(obj), media_type="application/json")
+
+
+def _inline_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    if isinstance(node, dict):
+        if "$ref" in node:
+            return _inline_refs(defs[node["$ref"]], defs)
+        return {k: _inline_refs(v, defs) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_inline_refs(v, defs) for v in node]
+    return node
+
+
+def _doc(tp: Any) -> Dict[int, Any]:
+    """msgspec 타입의 JSON 스키마를 OpenAPI 200 응답 문서로 변환 (response_model 대신)
+    
+    _encode 응답은 FastAPI가 스키마를 알 수 없으므로, $ref를 인라인한 스키마를 직접 붙입니다.
+    """
+    (schema,), defs = msgspec.json.schema_components([tp], ref_template="{name}")
+    return {200: {"content": {"application/json": {"schema": _inline_refs(schema, defs)}}}}
+
 
 @router.post("", response_model=QueryResponse)
 async def execute_query(request: QueryRequest):
     """Execute SQL query on MindsDB"""
-    result = await mindsdb_service.execute_query(request.query)
-    return QueryResponse(**result)
+    query = mindsdb_service.apply_limit(request.query, request.limit, request.offset)
+    result = await mindsdb_service.execute_query(query)
+    # 임의 SQL은 DB/모델/잡을 바꿀 수 있으므로 조회문이 아니면 메타데이터 캐시 무효화
+    if not request.query.lstrip().upper().startswith(_READ_ONLY_PREFIXES):
+        mindsdb_service.invalidate_cache()
+    # MindsDB 결과는 이미 QueryResponse 형태이므로 검증/변환 없이 dict를 바로 직렬화
+    return ORJSONResponse(result)
 
 
-@router.get("/status", response_model=MindsDBStatus)
+@router.post("/stream")
+async def execute_query_stream(
+    request: QueryRequest,
+    chunk_size: int = Query(1000, ge=1, le=100000, description="Rows per page")
+):
+    """Execute SQL query on MindsDB and stream rows as NDJSON
+    
+    전체 결과를 chunk_size 단위 LIMIT/OFFSET 페이지로 나눠 조회합니다 (limit/offset 필드는 무시).
+    페이지 경계가 고정되도록 SELECT에는 ORDER BY(고유 키 포함)가 있어야 합니다.
+    첫 줄에 columns, 이후 페이지마다 data 행을 한 줄씩 전송합니다.
+    """
+    error = mindsdb_service.stream_query_error(request.query)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    
+    if not request.query.lstrip().upper().startswith(_READ_ONLY_PREFIXES):
+        mindsdb_service.invalidate_cache()
+    
+    async def generate_chunks():
+        first = True
+        async for page in mindsdb_service.execute_query_stream(request.query, chunk_size):
+            if page["type"] == "error":
+                yield orjson.dumps({"error": page["error"]}) + b"\n"
+                return
+            if first:
+                yield orjson.dumps({"type": page["type"], "columns": page["columns"]}) + b"\n"
+                first = False
+            if page["data"]:
+                yield orjson.dumps({"data": page["data"]}) + b"\n"
+    
+    return StreamingResponse(generate_chunks(), media_type="application/x-ndjson")
+
+
+@router.get("/status", responses=_doc(MindsDBStatus))
 async def get_status():
     """Check MindsDB server status"""
     connected, version, error = await mindsdb_service.check_connection()
-    return MindsDBStatus(connected=connected, version=version, error=error)
+    return _encode(MindsDBStatus(connected=connected, version=version, error=error))
 
 
 @router.post("/materialized-table")
 async def create_materialized_table(request: MaterializedTableCreate):
-    """Create a materialized table from source data"""
+    """Create a materialized table from source data (optionally indexed and refreshed on a schedule)"""
     result = await mindsdb_service.create_materialized_table(
         table_name=request.table_name,
         source_database=request.source_database,
         source_table=request.source_table,
         columns=request.columns,
         where_clause=request.where_clause,
-        limit=request.limit
+        limit=request.limit,
+        indexes=request.indexes,
+        refresh_every=request.refresh_every
     )
     
     if result["type"] == "error":
         raise HTTPException(status_code=400, detail=result["error"])
     
-    return {"message": f"Materialized table '{request.table_name}' created successfully"}
+    # 정의를 Neo4j에 기록 - 실패해도 테이블 생성 자체는 성공으로 처리
+    try:
+        await neo4j_service.upsert_materialized_view(
+            name=request.table_name,
+            source_database=request.source_database,
+            source_table=request.source_table,
+            query=result["select_query"],
+            indexes=request.indexes,
+            refresh_every=request.refresh_every,
+            refresh_job=result["refresh_job"]
+        )
+    except Exception as e:
+        result["warnings"].append(f"neo4j: {e}")
+    
+    return {
+        "message": f"Materialized table '{request.table_name}' created successfully",
+        "refresh_job": result["refresh_job"],
+        "warnings": result["warnings"]
+    }
 
 
-@router.get("/models", response_model=List[ModelInfo])
+@router.get("/models", responses=_doc(List[ModelInfo]))
 async def get_models():
     """Get list of ML models"""
     models = await mindsdb_service.get_models()
-    return models
+    return _encode([ModelInfo(**m) for m in models])
 
 
-@router.get("/jobs", response_model=List[JobInfo])
+@router.get("/jobs", responses=_doc(List[JobInfo]))
 async def get_jobs():
-    """Get list of scheduled jobs"""
+    """Get list of scheduled jobs
+    
+    Materialized table 갱신 잡(refresh_<table>)에는 Neo4j에 저장된 정의를 함께 반환합니다.
+    """
     jobs = await mindsdb_service.get_jobs()
-    return jobs
+    try:
+        views = await neo4j_service.get_refreshed_materialized_views()
+    except Exception as e:
+        # Neo4j를 쓸 수 없으면 MindsDB 잡 목록만 반환
+        logger.warning(f"MaterializedView lookup failed: {e}")
+        views = []
+    by_job = {
+        mv["refresh_job"].lower(): MaterializedViewInfo(
+            name=mv["name"],
+            source_database=mv.get("source_database"),
+            source_table=mv.get("source_table"),
+            query=mv.get("query"),
+            indexes=mv.get("indexes") or [],
+            refresh_every=mv.get("refresh_every"),
+            updated_at=mv.get("updated_at")
+        )
+        for mv in views
+    }
+    return _encode([
+        JobInfo(**j, materialized_view=by_job.get(str(j["name"]).lower()))
+        for j in jobs
+    ])
 
 
-@router.get("/knowledge-bases", response_model=List[KnowledgeBaseInfo])
+@router.get("/knowledge-bases", responses=_doc(List[KnowledgeBaseInfo]))
 async def get_knowledge_bases():
     """Get list of knowledge bases"""
     kbs = await mindsdb_service.get_knowledge_bases()
-    return kbs
+    return _encode([KnowledgeBaseInfo(**kb) for kb in kbs])
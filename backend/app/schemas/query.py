@@ -1,4 +1,5 @@
 """Query schemas for MindsDB UI"""
+import msgspec
 from pydantic import BaseModel, Field
 from typing import Optional, List, Any, Dict
 
@@ -6,6 +7,8 @@ from typing import Optional, List, Any, Dict
 class QueryRequest(BaseModel):
     """Request schema for SQL query execution"""
     query: str = Field(..., description="SQL query to execute")
+    limit: Optional[int] = Field(1000, ge=1, le=100000, description="Max rows for SELECT without its own LIMIT")
+    offset: int = Field(0, ge=0, description="Row offset applied together with limit")
     
     class Config:
         json_schema_extra = {
@@ -33,6 +36,12 @@ class MaterializedTableCreate(BaseModel):
     columns: List[str] = Field(default=["*"], description="Columns to include")
     where_clause: Optional[str] = Field(None, description="Optional WHERE clause")
     limit: Optional[int] = Field(None, description="Optional LIMIT")
+    indexes: List[str] = Field(default=[], description="Columns to index on the new table")
+    refresh_every: Optional[str] = Field(
+        None,
+        pattern=r"(?i)^\d+\s+(minute|hour|day|week|month)s?$",
+        description="Refresh interval for a MindsDB job: '<n> minute|hour|day|week|month[s]' (e.g. '1 hour')"
+    )
     
     class Config:
         json_schema_extra = {
@@ -41,33 +50,53 @@ class MaterializedTableCreate(BaseModel):
                 "source_database": "mysql_demo",
                 "source_table": "home_rentals",
                 "columns": ["*"],
-                "limit": 1000
+                "limit": 1000,
+                "indexes": ["neighborhood"],
+                "refresh_every": "1 day"
             }
         }
 
 
-class ModelInfo(BaseModel):
-    """Model information schema"""
+# ========================================
+# Response structs (msgspec)
+# Pydantic stays on request models (external input) and QueryResponse docs;
+# pure data carriers below are encoded directly without re-validation.
+# ========================================
+
+class ModelInfo(msgspec.Struct):
+    """Model information"""
     name: str
     status: str
     predict: Optional[str] = None
     engine: Optional[str] = None
 
 
-class JobInfo(BaseModel):
-    """Job information schema"""
+class MaterializedViewInfo(msgspec.Struct):
+    """Materialized table definition refreshed by a job"""
+    name: str
+    source_database: Optional[str] = None
+    source_table: Optional[str] = None
+    query: Optional[str] = None
+    indexes: List[str] = []
+    refresh_every: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+class JobInfo(msgspec.Struct):
+    """Job information"""
     name: str
     schedule: Optional[str] = None
     next_run: Optional[str] = None
+    materialized_view: Optional[MaterializedViewInfo] = None
 
 
-class KnowledgeBaseInfo(BaseModel):
-    """Knowledge Base information schema"""
+class KnowledgeBaseInfo(msgspec.Struct):
+    """Knowledge Base information"""
     name: str
     model: Optional[str] = None
 
 
-class MindsDBStatus(BaseModel):
+class MindsDBStatus(msgspec.Struct):
     """MindsDB server status"""
     connected: bool
     version: Optional[str] = None
@@ -1,17 +1,49 @@
 """MindsDB Service - HTTP API Client"""
+import asyncio
 import httpx
 import json
+import orjson
+import re
 import time
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, AsyncGenerator, Awaitable, Callable
 import os
+from cachetools import TTLCache
+
+
+_SELECT_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_LIMIT_RE = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+_ORDER_BY_RE = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+# String literals / quoted identifiers / comments, matched left to right so a "--" inside
+# a literal stays part of the literal
+_SQL_LITERAL_OR_COMMENT_RE = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`(?:[^`]|``)*`|--[^\n]*|/\*.*?\*/",
+    re.DOTALL
+)
+# Job schedule accepted for EVERY (interpolated into CREATE JOB, so nothing else is allowed)
+_REFRESH_EVERY_RE = re.compile(r"^\d+\s+(minute|hour|day|week|month)s?$", re.IGNORECASE)
+
+# Internal MindsDB databases hidden from the data source list
+_INTERNAL_DBS = frozenset({"mindsdb", "information_schema", "files", "log"})
 
 
 class MindsDBService:
     """Service for interacting with MindsDB HTTP SQL API"""
     
+    # Names of objects created here (and derived job/index names) must match this
+    _IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
+    
     def __init__(self, base_url: str = None):
         self._fixed_base_url = base_url
         self.timeout = 120.0
+        self._client: Optional[httpx.AsyncClient] = None
+        # Metadata (SHOW/DESCRIBE) result cache - changes on the order of minutes
+        self._meta_cache: TTLCache = TTLCache(maxsize=512, ttl=30)
+        # In-flight metadata fetches, removed as soon as each one completes
+        self._meta_inflight: Dict[tuple, asyncio.Future] = {}
+        # Bumped on invalidation; a fetch started under an older generation is not cached
+        self._meta_generation = 0
+        # Encoded responses (source result, encoded) valid only while that result is the cached entry
+        self._encoded_cache: TTLCache = TTLCache(maxsize=512, ttl=30)
     
     @property
     def base_url(self) -> str:
@@ -30,6 +62,47 @@ class MindsDBService:
         """Get API endpoint"""
         return f"{self.base_url}/api/sql/query"
     
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get shared AsyncClient (created lazily, keeps pooled keep-alive connections)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+                headers={"Content-Type": "application/json"}
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close shared AsyncClient"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _q(self, ident: str) -> str:
+        """Validate a name for a new object before interpolating it into SQL"""
+        if not isinstance(ident, str) or not self._IDENT.match(ident):
+            raise ValueError(f"Invalid identifier: {ident!r}")
+        return ident
+    
+    @staticmethod
+    def _quote(ident: str) -> str:
+        """Quote an existing object's name as a backtick identifier (any legal name, e.g. with '-' or non-ASCII)"""
+        if not isinstance(ident, str) or not ident:
+            raise ValueError(f"Invalid identifier: {ident!r}")
+        return "`" + ident.replace("`", "``") + "`"
+    
+    @staticmethod
+    def _error_result(message: str) -> Dict[str, Any]:
+        """Error result in the same shape as execute_query"""
+        return {
+            "type": "error",
+            "columns": [],
+            "data": [],
+            "row_count": 0,
+            "error": message,
+            "execution_time": 0
+        }
+    
     async def execute_query(self, query: str) -> Dict[str, Any]:
         """Execute SQL query via MindsDB HTTP API"""
         import logging
@@ -39,43 +112,39 @@ class MindsDBService:
         logger.info(f"MindsDB execute_query: endpoint={self.api_endpoint}, query={query[:100]}...")
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.api_endpoint,
-                    headers={"Content-Type": "application/json"},
-                    json={"query": query}
-                )
-                logger.info(f"MindsDB response status: {response.status_code}")
-                result = response.json()
-                execution_time = time.time() - start_time
-                
-                if result.get("type") == "error":
-                    return {
-                        "type": "error",
-                        "columns": [],
-                        "data": [],
-                        "row_count": 0,
-                        "error": result.get("error_message", "Unknown error"),
-                        "execution_time": execution_time
-                    }
-                elif result.get("type") == "table":
-                    return {
-                        "type": "table",
-                        "columns": result.get("column_names", []),
-                        "data": result.get("data", []),
-                        "row_count": len(result.get("data", [])),
-                        "error": None,
-                        "execution_time": execution_time
-                    }
-                else:
-                    return {
-                        "type": "ok",
-                        "columns": [],
-                        "data": [],
-                        "row_count": 0,
-                        "error": None,
-                        "execution_time": execution_time
-                    }
+            client = await self._get_client()
+            response = await client.post(self.api_endpoint, json={"query": query})
+            logger.info(f"MindsDB response status: {response.status_code}")
+            result = orjson.loads(response.content)
+            execution_time = time.time() - start_time
+            
+            if result.get("type") == "error":
+                return {
+                    "type": "error",
+                    "columns": [],
+                    "data": [],
+                    "row_count": 0,
+                    "error": result.get("error_message", "Unknown error"),
+                    "execution_time": execution_time
+                }
+            elif result.get("type") == "table":
+                return {
+                    "type": "table",
+                    "columns": result.get("column_names", []),
+                    "data": result.get("data", []),
+                    "row_count": len(result.get("data", [])),
+                    "error": None,
+                    "execution_time": execution_time
+                }
+            else:
+                return {
+                    "type": "ok",
+                    "columns": [],
+                    "data": [],
+                    "row_count": 0,
+                    "error": None,
+                    "execution_time": execution_time
+                }
         except httpx.TimeoutException:
             return {
                 "type": "error",
@@ -95,6 +164,146 @@ class MindsDBService:
                 "execution_time": time.time() - start_time
             }
     
+    async def _cached_query(self, key: tuple, query: str) -> Dict[str, Any]:
+        """Execute metadata query through the TTL cache (one in-flight fetch per key)"""
+        if key in self._meta_cache:
+            return self._meta_cache[key]
+        
+        fetch = self._meta_inflight.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fill_cache(key, query, self._meta_generation))
+            self._meta_inflight[key] = fetch
+            fetch.add_done_callback(lambda f: self._forget_fetch(key, f))
+        # shield: a cancelled caller must not cancel the fetch other callers await
+        return await asyncio.shield(fetch)
+    
+    async def _fill_cache(self, key: tuple, query: str, generation: int) -> Dict[str, Any]:
+        """Run a metadata query and cache its result unless it failed or was invalidated meanwhile"""
+        result = await self.execute_query(query)
+        # Errors are not cached so a recovered server is seen immediately
+        if result["type"] != "error" and generation == self._meta_generation:
+            self._meta_cache[key] = result
+        return result
+    
+    async def cached_encoding(
+        self,
+        key: tuple,
+        build: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any]
+    ) -> Any:
+        """encode(await build()), reused for as long as the metadata cache entry `key` is unchanged
+        
+        build must read through the metadata cache under the same key (e.g. get_databases for
+        ("databases",)); repeat hits then skip both the post-processing and the encoding.
+        """
+        entry = self._encoded_cache.get(key)
+        if entry is not None and self._meta_cache.get(key) is entry[0]:
+            return entry[1]
+        generation = self._meta_generation
+        encoded = encode(await build())
+        source = self._meta_cache.get(key)
+        # Errors are not cached upstream, so their encodings are not kept either
+        if source is not None and generation == self._meta_generation:
+            self._encoded_cache[key] = (source, encoded)
+        return encoded
+    
+    def _forget_fetch(self, key: tuple, fetch: asyncio.Future):
+        """Drop a finished fetch unless invalidation already replaced it"""
+        if self._meta_inflight.get(key) is fetch:
+            del self._meta_inflight[key]
+    
+    def _drop_cached(self, key: tuple):
+        """Invalidate a single metadata key (cached result and in-flight fetch)"""
+        self._meta_generation += 1
+        for store in (self._meta_cache, self._meta_inflight, self._encoded_cache):
+            store.pop(key, None)
+    
+    def invalidate_cache(self, database: str = None):
+        """Invalidate cached metadata (all, or the entries related to one database)
+        
+        In-flight fetches are detached too: they may have read the catalog before the
+        change, so later callers start a fresh fetch and the old result is not cached.
+        """
+        self._meta_generation += 1
+        if database is None:
+            self._meta_cache.clear()
+            self._meta_inflight.clear()
+            self._encoded_cache.clear()
+            return
+        for store in (self._meta_cache, self._meta_inflight, self._encoded_cache):
+            store.pop(("databases",), None)
+            for key in list(store.keys()):
+                if len(key) > 1 and key[1] == database:
+                    store.pop(key, None)
+    
+    @staticmethod
+    def _strip_comments(query: str) -> str:
+        """Remove SQL comments (literals are kept as they are)"""
+        return _SQL_LITERAL_OR_COMMENT_RE.sub(
+            lambda m: " " if m.group().startswith(("--", "/*")) else m.group(), query
+        )
+    
+    @staticmethod
+    def _sql_code(query: str) -> str:
+        """Query with comments and literals blanked out, for keyword detection"""
+        return _SQL_LITERAL_OR_COMMENT_RE.sub(
+            lambda m: " " if m.group().startswith(("--", "/*")) else "''", query
+        )
+    
+    @classmethod
+    def apply_limit(cls, query: str, limit: Optional[int], offset: int = 0) -> str:
+        """Append LIMIT/OFFSET to a SELECT that has no LIMIT of its own
+        
+        Comments and the trailing ";" are removed first so the clause cannot end up
+        inside a trailing "--" comment.
+        """
+        code = cls._sql_code(query)
+        if not limit or not _SELECT_RE.match(code) or _LIMIT_RE.search(code):
+            return query
+        query = cls._strip_comments(query).rstrip().rstrip(";").rstrip()
+        query += f" LIMIT {int(limit)}"
+        if offset:
+            query += f" OFFSET {int(offset)}"
+        return query
+    
+    @classmethod
+    def stream_query_error(cls, query: str) -> Optional[str]:
+        """Reason a query cannot be streamed page by page, or None
+        
+        LIMIT/OFFSET pages are only stable under a deterministic order, so a paginated
+        SELECT must carry its own ORDER BY (ideally ending in a unique key).
+        """
+        code = cls._sql_code(query)
+        if _SELECT_RE.match(code) and not _LIMIT_RE.search(code) and not _ORDER_BY_RE.search(code):
+            return "Streaming a SELECT requires an ORDER BY (on a unique key) so pages do not overlap or skip rows"
+        return None
+    
+    async def execute_query_stream(
+        self,
+        query: str,
+        chunk_size: int = 1000
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Execute a SELECT page by page (LIMIT/OFFSET), yielding one result per page
+        
+        Queries that are not paginable (non-SELECT or with their own LIMIT) are
+        executed once and yielded as a single page. A paginable SELECT without
+        ORDER BY yields a single error result (see stream_query_error).
+        """
+        error = self.stream_query_error(query)
+        if error:
+            yield self._error_result(error)
+            return
+        
+        offset = 0
+        while True:
+            paged = self.apply_limit(query, chunk_size, offset)
+            result = await self.execute_query(paged)
+            yield result
+            # 페이지가 chunk_size와 다르면 마지막 페이지 (초과 = LIMIT이 적용되지 않음)
+            if paged == query or result["type"] != "table" or result["row_count"] != chunk_size:
+                return
+            offset += chunk_size
+    
     async def check_connection(self) -> Tuple[bool, Optional[str], Optional[str]]:
         """Check if MindsDB server is accessible"""
         try:
@@ -109,32 +318,51 @@ class MindsDBService:
     
     async def get_databases(self) -> List[Dict[str, Any]]:
         """Get list of databases (data sources)"""
-        result = await self.execute_query("SHOW DATABASES")
+        result = await self._cached_query(("databases",), "SHOW DATABASES")
         if result["type"] != "table":
             return []
         
-        databases = []
-        for row in result["data"]:
-            db_name = row[0] if row else ""
-            # Skip internal databases
-            if db_name not in ["mindsdb", "information_schema", "files", "log"]:
-                databases.append({
-                    "name": db_name,
-                    "engine": row[1] if len(row) > 1 else "unknown",
-                    "tables": []
-                })
-        return databases
+        # Skip internal databases
+        return [
+            {"name": row[0], "engine": row[1] if len(row) > 1 else "unknown", "tables": []}
+            for row in result["data"]
+            if row and row[0] not in _INTERNAL_DBS
+        ]
+    
+    async def database_exists(self, name: str) -> bool:
+        """Check whether a database is registered (single-row lookup)
+        
+        Raises RuntimeError when MindsDB cannot answer (unreachable, timeout, query error)
+        so an outage is not reported as "not registered".
+        """
+        escaped = name.replace("'", "''")
+        result = await self.execute_query(
+            f"SELECT NAME FROM information_schema.databases WHERE NAME = '{escaped}' LIMIT 1"
+        )
+        if result["type"] == "error":
+            raise RuntimeError(f"MindsDB lookup failed: {result['error']}")
+        return result["type"] == "table" and bool(result["data"])
     
     async def get_tables(self, database: str) -> List[str]:
         """Get list of tables in a database"""
-        result = await self.execute_query(f"SHOW TABLES FROM {database}")
+        query = f"SHOW TABLES FROM {self._quote(database)}"
+        result = await self._cached_query(("tables", database), query)
         if result["type"] != "table":
             return []
         return [row[0] for row in result["data"] if row]
     
+    async def probe_database(self, database: str) -> Dict[str, Any]:
+        """Connectivity probe: list at most one table of a database (errors are returned in the result)"""
+        try:
+            query = f"SHOW TABLES FROM {self._quote(database)} LIMIT 1"
+        except ValueError as e:
+            return self._error_result(str(e))
+        return await self.execute_query(query)
+    
     async def get_table_schema(self, database: str, table: str) -> List[Dict[str, Any]]:
         """Get table schema/columns"""
-        result = await self.execute_query(f"DESCRIBE {database}.{table}")
+        query = f"DESCRIBE {self._quote(database)}.{self._quote(table)}"
+        result = await self._cached_query(("schema", database, table), query)
         if result["type"] != "table":
             return []
         
@@ -150,7 +378,10 @@ class MindsDBService:
     
     async def sample_data(self, database: str, table: str, limit: int = 10) -> Dict[str, Any]:
         """Get sample data from a table"""
-        query = f"SELECT * FROM {database}.{table} LIMIT {limit}"
+        try:
+            query = f"SELECT * FROM {self._quote(database)}.{self._quote(table)} LIMIT {int(limit)}"
+        except ValueError as e:
+            return self._error_result(str(e))
         return await self.execute_query(query)
     
     async def create_database(self, name: str, engine: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -192,6 +423,7 @@ class MindsDBService:
             
             logger.info(f"REST API response status: {response.status_code}")
             print(f"REST API response status: {response.status_code}")
+            self.invalidate_cache(name)
             
             if response.status_code in [200, 201]:
                 return {
@@ -229,8 +461,13 @@ class MindsDBService:
     
     async def drop_database(self, name: str) -> Dict[str, Any]:
         """Drop a database connection"""
-        query = f"DROP DATABASE IF EXISTS {name}"
-        return await self.execute_query(query)
+        try:
+            query = f"DROP DATABASE IF EXISTS {self._quote(name)}"
+        except ValueError as e:
+            return self._error_result(str(e))
+        result = await self.execute_query(query)
+        self.invalidate_cache(name)
+        return result
     
     async def create_materialized_table(
         self, 
@@ -239,69 +476,128 @@ class MindsDBService:
         source_table: str,
         columns: List[str] = None,
         where_clause: str = None,
-        limit: int = None
+        limit: int = None,
+        indexes: List[str] = None,
+        refresh_every: str = None
     ) -> Dict[str, Any]:
-        """Create a materialized table from source"""
-        cols = ", ".join(columns) if columns else "*"
-        query = f"CREATE TABLE mindsdb.{table_name} AS SELECT {cols} FROM {source_database}.{source_table}"
+        """Create a materialized table from source, with optional indexes and a refresh job
+        
+        The returned result carries `select_query`, `refresh_job` and `warnings`
+        (index/job statements the target engine rejected) in addition to the CTAS result.
+        """
+        try:
+            table_name = self._q(table_name)
+            indexes = [self._q(col) for col in indexes or []]
+            select_from = f"{self._quote(source_database)}.{self._quote(source_table)}"
+            cols = ", ".join(c if c == "*" else self._quote(c) for c in columns) if columns else "*"
+            if refresh_every is not None and not _REFRESH_EVERY_RE.fullmatch(refresh_every):
+                raise ValueError(f"Invalid refresh interval: {refresh_every!r} (expected e.g. '1 hour')")
+        except ValueError as e:
+            return {**self._error_result(str(e)), "select_query": None, "refresh_job": None, "warnings": []}
+        
+        select_query = f"SELECT {cols} FROM {select_from}"
         
         if where_clause:
-            query += f" WHERE {where_clause}"
+            select_query += f" WHERE {where_clause}"
         if limit:
-            query += f" LIMIT {limit}"
+            select_query += f" LIMIT {limit}"
         
-        return await self.execute_query(query)
+        result = await self.execute_query(f"CREATE TABLE mindsdb.{table_name} AS {select_query}")
+        self.invalidate_cache("mindsdb")
+        result["select_query"] = select_query
+        result["refresh_job"] = None
+        result["warnings"] = []
+        if result["type"] == "error":
+            return result
+        
+        # 조회 패턴에 맞는 인덱스 생성 (엔진이 지원하지 않으면 경고로만 기록)
+        index_statements = []
+        for col in indexes:
+            statement = f"CREATE INDEX idx_{table_name}_{col} ON mindsdb.{table_name}({col})"
+            index_result = await self.execute_query(statement)
+            if index_result["type"] == "error":
+                result["warnings"].append(f"index on '{col}': {index_result['error']}")
+            else:
+                index_statements.append(statement)
+        
+        # 주기적 갱신: 테이블을 다시 만드는 MindsDB JOB 등록
+        # (테이블을 새로 만들면 인덱스도 사라지므로 생성에 성공한 인덱스는 잡에서 다시 생성)
+        if refresh_every:
+            job_name = f"refresh_{table_name}"
+            await self.execute_query(f"DROP JOB IF EXISTS {job_name}")
+            job_body = "; ".join([
+                f"DROP TABLE IF EXISTS mindsdb.{table_name}",
+                f"CREATE TABLE mindsdb.{table_name} AS {select_query}",
+                *index_statements
+            ])
+            job_result = await self.execute_query(
+                f"CREATE JOB {job_name} ({job_body}) EVERY {refresh_every}"
+            )
+            self._drop_cached(("jobs",))
+            if job_result["type"] == "error":
+                result["warnings"].append(f"refresh job: {job_result['error']}")
+            else:
+                result["refresh_job"] = job_name
+        
+        return result
     
     async def get_models(self) -> List[Dict[str, Any]]:
         """Get list of ML models"""
-        result = await self.execute_query("SHOW MODELS")
+        result = await self._cached_query(("models",), "SHOW MODELS")
         if result["type"] != "table":
             return []
         
-        models = []
-        columns = result["columns"]
-        for row in result["data"]:
-            model_data = dict(zip(columns, row))
-            models.append({
-                "name": model_data.get("NAME", model_data.get("name", "")),
-                "status": model_data.get("STATUS", model_data.get("status", "")),
-                "predict": model_data.get("PREDICT", model_data.get("predict", "")),
-                "engine": model_data.get("ENGINE", model_data.get("engine", ""))
-            })
-        return models
+        # 컬럼 인덱스를 한 번만 계산 (대소문자 무관)
+        cols = {c.upper(): i for i, c in enumerate(result["columns"])}
+        name_i = cols.get("NAME")
+        status_i = cols.get("STATUS")
+        predict_i = cols.get("PREDICT")
+        engine_i = cols.get("ENGINE")
+        return [
+            {
+                "name": row[name_i] if name_i is not None else "",
+                "status": row[status_i] if status_i is not None else "",
+                "predict": row[predict_i] if predict_i is not None else "",
+                "engine": row[engine_i] if engine_i is not None else ""
+            }
+            for row in result["data"]
+        ]
     
     async def get_jobs(self) -> List[Dict[str, Any]]:
         """Get list of jobs"""
-        result = await self.execute_query("SHOW JOBS")
+        result = await self._cached_query(("jobs",), "SHOW JOBS")
         if result["type"] != "table":
             return []
         
-        jobs = []
-        columns = result["columns"]
-        for row in result["data"]:
-            job_data = dict(zip(columns, row))
-            jobs.append({
-                "name": job_data.get("NAME", job_data.get("name", "")),
-                "schedule": job_data.get("SCHEDULE", job_data.get("schedule", "")),
-                "next_run": job_data.get("NEXT_RUN", job_data.get("next_run", ""))
-            })
-        return jobs
+        cols = {c.upper(): i for i, c in enumerate(result["columns"])}
+        name_i = cols.get("NAME")
+        schedule_i = cols.get("SCHEDULE")
+        next_run_i = cols.get("NEXT_RUN")
+        return [
+            {
+                "name": row[name_i] if name_i is not None else "",
+                "schedule": row[schedule_i] if schedule_i is not None else "",
+                "next_run": row[next_run_i] if next_run_i is not None else ""
+            }
+            for row in result["data"]
+        ]
     
     async def get_knowledge_bases(self) -> List[Dict[str, Any]]:
         """Get list of knowledge bases"""
-        result = await self.execute_query("SHOW KNOWLEDGE_BASES")
+        result = await self._cached_query(("knowledge_bases",), "SHOW KNOWLEDGE_BASES")
         if result["type"] != "table":
             return []
         
-        kbs = []
-        columns = result["columns"]
-        for row in result["data"]:
-            kb_data = dict(zip(columns, row))
-            kbs.append({
-                "name": kb_data.get("NAME", kb_data.get("name", "")),
-                "model": kb_data.get("MODEL", kb_data.get("model", ""))
-            })
-        return kbs
+        cols = {c.upper(): i for i, c in enumerate(result["columns"])}
+        name_i = cols.get("NAME")
+        model_i = cols.get("MODEL")
+        return [
+            {
+                "name": row[name_i] if name_i is not None else "",
+                "model": row[model_i] if model_i is not None else ""
+            }
+            for row in result["data"]
+        ]
 
 
 # Singleton instance
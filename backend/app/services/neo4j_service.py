@@ -1,9 +1,213 @@
 """Neo4j Service - DataSource Node Management"""
+import asyncio
+import logging
 import os
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
-from neo4j import AsyncGraphDatabase
+from neo4j import AsyncGraphDatabase, RoutingControl
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
+
+# ========================================
+# Cypher 쿼리 (모듈 로드 시 한 번만 생성)
+# ========================================
+
+_Q_CREATE_DATASOURCE = """
+MERGE (ds:DataSource {name: $name})
+SET ds.engine = $engine,
+    ds.display_name = $display_name,
+    ds.host = $host,
+    ds.port = $port,
+    ds.database = $database,
+    ds.user = $user,
+    ds.password = $password,
+    ds.created_at = datetime(),
+    ds.updated_at = datetime()
+RETURN ds {
+    .name, .engine, .display_name, .host, .port, .database, .user,
+    created_at: toString(ds.created_at)
+} AS datasource
+"""
+
+_Q_GET_DATASOURCES = """
+MATCH (ds:DataSource)
+OPTIONAL MATCH (ds)-[:HAS_SCHEMA]->(s:Schema)
+WITH ds, COUNT(s) as schema_count
+RETURN ds {
+    .name, .display_name, .host, .port, .database, .user,
+    engine: coalesce(ds.engine, 'unknown'),
+    tables: [],
+    schema_count: schema_count,
+    created_at: toString(ds.created_at)
+} AS datasource
+ORDER BY ds.name
+"""
+
+_Q_GET_DATASOURCE_WITH_PW = """
+MATCH (ds:DataSource {name: $name})
+OPTIONAL MATCH (ds)-[:HAS_SCHEMA]->(s:Schema)
+WITH ds, COLLECT(s.name) as schemas
+RETURN ds {
+    .name, .engine, .display_name, .host, .port, .database, .user, .password,
+    schemas: schemas,
+    schema_version: coalesce(ds.schema_version, 0),
+    created_at: toString(ds.created_at)
+} AS datasource
+"""
+
+_Q_GET_DATASOURCE = """
+MATCH (ds:DataSource {name: $name})
+OPTIONAL MATCH (ds)-[:HAS_SCHEMA]->(s:Schema)
+WITH ds, COLLECT(s.name) as schemas
+RETURN ds {
+    .name, .engine, .display_name, .host, .port, .database, .user,
+    schemas: schemas,
+    schema_version: coalesce(ds.schema_version, 0),
+    created_at: toString(ds.created_at)
+} AS datasource
+"""
+
+_Q_GET_CONNECTION_PARAMS = """
+MATCH (ds:DataSource {name: $name})
+RETURN {
+    engine: ds.engine,
+    host: ds.host,
+    port: ds.port,
+    database: ds.database,
+    user: ds.user,
+    password: ds.password
+} AS connection
+"""
+
+_Q_GET_ALL_CONNECTION_PARAMS = """
+MATCH (ds:DataSource)
+RETURN {
+    name: ds.name,
+    engine: ds.engine,
+    host: ds.host,
+    port: ds.port,
+    database: ds.database,
+    user: ds.user,
+    password: ds.password
+} AS connection
+ORDER BY ds.name
+"""
+
+_Q_DELETE_DATASOURCE = """
+MATCH (ds:DataSource {name: $name})
+OPTIONAL MATCH (ds)-[:HAS_SCHEMA]->(s:Schema)
+OPTIONAL MATCH (s)-[:HAS_TABLE]->(t:Table)
+OPTIONAL MATCH (t)-[:HAS_COLUMN]->(c:Column)
+DETACH DELETE ds, s, t, c
+RETURN COUNT(*) as deleted
+"""
+
+_Q_BUMP_SCHEMA_VERSION = """
+MATCH (ds:DataSource {name: $name})
+SET ds.schema_version = coalesce(ds.schema_version, 0) + 1
+RETURN ds.schema_version AS schema_version
+"""
+
+_Q_GET_SCHEMAS = """
+MATCH (ds:DataSource {name: $datasource_name})-[:HAS_SCHEMA]->(s:Schema)
+OPTIONAL MATCH (s)-[:HAS_TABLE]->(t:Table)
+WITH s, COUNT(t) as table_count
+RETURN s {
+    .name, .description,
+    table_count: table_count
+} AS schema
+ORDER BY s.name
+"""
+
+_Q_CREATE_SCHEMA = """
+MATCH (ds:DataSource {name: $datasource_name})
+MERGE (s:Schema {name: $schema_name})
+SET s.description = $description,
+    s.created_at = datetime()
+MERGE (ds)-[:HAS_SCHEMA]->(s)
+RETURN s {.name, .description} AS schema
+"""
+
+_Q_GET_TABLES_BY_SCHEMA = """
+MATCH (ds:DataSource {name: $datasource_name})-[:HAS_SCHEMA]->(s:Schema {name: $schema_name})-[:HAS_TABLE]->(t:Table)
+OPTIONAL MATCH (t)-[:HAS_COLUMN]->(c:Column)
+WITH t, COUNT(c) as column_count
+RETURN t {
+    .name, .description, .schema,
+    column_count: column_count
+} AS table
+ORDER BY t.name
+"""
+
+_Q_GET_TABLES = """
+MATCH (ds:DataSource {name: $datasource_name})-[:HAS_SCHEMA]->(s:Schema)-[:HAS_TABLE]->(t:Table)
+OPTIONAL MATCH (t)-[:HAS_COLUMN]->(c:Column)
+WITH t, s, COUNT(c) as column_count
+RETURN t {
+    .name, .description,
+    schema: s.name,
+    column_count: column_count
+} AS table
+ORDER BY s.name, t.name
+"""
+
+_Q_UPSERT_MATERIALIZED_VIEW = """
+MERGE (mv:MaterializedView {name: $name})
+SET mv.source_database = $source_database,
+    mv.source_table = $source_table,
+    mv.query = $query,
+    mv.indexes = $indexes,
+    mv.refresh_every = $refresh_every,
+    mv.refresh_job = $refresh_job,
+    mv.updated_at = datetime()
+WITH mv
+OPTIONAL MATCH (ds:DataSource {name: $source_database})
+FOREACH (_ IN CASE WHEN ds IS NULL THEN [] ELSE [1] END |
+    MERGE (mv)-[:MATERIALIZED_FROM]->(ds)
+)
+RETURN mv {
+    .name, .source_database, .source_table, .query, .indexes, .refresh_every, .refresh_job,
+    updated_at: toString(mv.updated_at)
+} AS materialized_view
+"""
+
+_Q_GET_REFRESHED_MATERIALIZED_VIEWS = """
+MATCH (mv:MaterializedView)
+WHERE mv.refresh_job IS NOT NULL
+RETURN mv {
+    .name, .source_database, .source_table, .query, .indexes, .refresh_every, .refresh_job,
+    updated_at: toString(mv.updated_at)
+} AS materialized_view
+"""
+
+_Q_SERVER_EDITION = "CALL dbms.components() YIELD edition RETURN edition"
+
+# Table (schema, name) 조회 키 - NODE KEY 제약조건은 자체 인덱스를 가지며, 같은 속성의 인덱스가
+# 먼저 있으면 생성이 거부되므로 Enterprise에서는 인덱스를 지우고 제약조건만 둠
+_TABLE_KEY_ENTERPRISE = (
+    "DROP INDEX table_schema_name IF EXISTS",
+    "CREATE CONSTRAINT table_key IF NOT EXISTS FOR (t:Table) REQUIRE (t.schema, t.name) IS NODE KEY",
+)
+# NODE KEY는 Enterprise 전용 - Community에서는 복합 인덱스로 대체
+_TABLE_KEY_COMMUNITY = (
+    "CREATE INDEX table_schema_name IF NOT EXISTS FOR (t:Table) ON (t.schema, t.name)",
+)
+
+
+@lru_cache(maxsize=64)
+def _build_update_query(keys: tuple) -> str:
+    """update_datasource용 SET 쿼리 생성 (갱신 키 조합별로 캐시)"""
+    set_clauses = ["ds.updated_at = datetime()"] + [f"ds.{key} = ${key}" for key in keys]
+    return f"""
+MATCH (ds:DataSource {{name: $name}})
+SET {', '.join(set_clauses)}
+RETURN ds {{
+    .name, .engine, .display_name, .host, .port, .database, .user,
+    updated_at: toString(ds.updated_at)
+}} AS datasource
+"""
 
 @dataclass
 class Neo4jConfig:
@@ -28,13 +232,37 @@ class Neo4jService:
         self.config = config
         self._driver = None
     
-    async def _get_driver(self):
-        """드라이버 lazy 초기화"""
+    async def connect(
+        self,
+        pool_size: int = 50,
+        connection_acquisition_timeout: float = 30.0,
+        max_connection_lifetime: int = 3600,
+        warmup: int = 5
+    ) -> None:
+        """
+        드라이버 생성, 연결 확인 및 커넥션 풀 워밍업 (앱 시작 시 한 번 호출)
+        
+        연결 확인이 실패해도 드라이버는 유지되므로 Neo4j가 나중에 올라오면 이후 요청은 정상 처리됩니다.
+        """
         if self._driver is None:
             self._driver = AsyncGraphDatabase.driver(
                 self.config.uri,
-                auth=(self.config.user, self.config.password)
+                auth=(self.config.user, self.config.password),
+                max_connection_pool_size=pool_size,
+                connection_acquisition_timeout=connection_acquisition_timeout,
+                max_connection_lifetime=max_connection_lifetime
             )
+        await self._driver.verify_connectivity()
+        # 동시에 세션을 열어 풀에 연결을 미리 확보
+        await asyncio.gather(*[
+            self.execute_query("RETURN 1", routing=RoutingControl.READ) for _ in range(warmup)
+        ])
+    
+    @property
+    def driver(self):
+        """connect()에서 생성한 드라이버 (요청 경로에서 lazy 초기화 경쟁이 없도록 미리 생성 필요)"""
+        if self._driver is None:
+            raise RuntimeError("Neo4j driver is not initialized - call neo4j_service.connect() on startup")
         return self._driver
     
     async def close(self):
@@ -43,13 +271,42 @@ class Neo4jService:
             await self._driver.close()
             self._driver = None
     
-    async def execute_query(self, query: str, params: Dict[str, Any] = None) -> List[Dict]:
-        """Cypher 쿼리 실행"""
-        driver = await self._get_driver()
-        async with driver.session(database=self.config.database) as session:
-            result = await session.run(query, params or {})
-            records = await result.data()
-            return records
+    async def execute_query(
+        self,
+        query: str,
+        params: Dict[str, Any] = None,
+        routing: RoutingControl = RoutingControl.WRITE
+    ) -> List[Dict]:
+        """Cypher 쿼리 실행 (driver.execute_query - 관리형 트랜잭션, 북마크/라우팅 테이블 재사용)"""
+        records, _, _ = await self.driver.execute_query(
+            query, params or {},
+            database_=self.config.database,
+            routing_=routing
+        )
+        return [record.data() for record in records]
+    
+    async def execute_query_values(
+        self,
+        query: str,
+        params: Dict[str, Any] = None,
+        routing: RoutingControl = RoutingControl.READ
+    ) -> List[tuple]:
+        """Cypher 쿼리 실행 - 레코드를 dict 대신 값 튜플로 반환 (단일 컬럼 RETURN용)"""
+        records, _, _ = await self.driver.execute_query(
+            query, params or {},
+            database_=self.config.database,
+            routing_=routing
+        )
+        return [record.values() for record in records]
+    
+    def session(self, **kwargs):
+        """
+        설정된 database의 세션 생성 (async with로 사용)
+        
+        여러 쿼리/명시적 트랜잭션을 한 연결에서 실행할 때 사용 - 자동 커밋이 필요한
+        `CALL { ... } IN TRANSACTIONS`도 session.run으로 실행 가능
+        """
+        return self.driver.session(database=self.config.database, **kwargs)
     
     # ========================================
     # DataSource CRUD Operations
@@ -64,24 +321,7 @@ class Neo4jService:
     ) -> Dict[str, Any]:
         """DataSource 노드 생성 - 연결 정보(비밀번호 포함) 모두 저장"""
         # TODO: 프로덕션에서는 비밀번호를 암호화하여 저장해야 함
-        query = """
-        MERGE (ds:DataSource {name: $name})
-        SET ds.engine = $engine,
-            ds.display_name = $display_name,
-            ds.host = $host,
-            ds.port = $port,
-            ds.database = $database,
-            ds.user = $user,
-            ds.password = $password,
-            ds.created_at = datetime(),
-            ds.updated_at = datetime()
-        RETURN ds {
-            .name, .engine, .display_name, .host, .port, .database, .user,
-            created_at: toString(ds.created_at)
-        } AS datasource
-        """
-        
-        result = await self.execute_query(query, {
+        result = await self.execute_query(_Q_CREATE_DATASOURCE, {
             "name": name,
             "engine": engine,
             "display_name": display_name or name,
@@ -96,74 +336,31 @@ class Neo4jService:
     
     async def get_datasources(self) -> List[Dict[str, Any]]:
         """모든 DataSource 노드 조회"""
-        query = """
-        MATCH (ds:DataSource)
-        OPTIONAL MATCH (ds)-[:HAS_SCHEMA]->(s:Schema)
-        WITH ds, COUNT(s) as schema_count
-        RETURN ds {
-            .name, .engine, .display_name, .host, .port, .database, .user,
-            schema_count: schema_count,
-            created_at: toString(ds.created_at)
-        } AS datasource
-        ORDER BY ds.name
-        """
-        results = await self.execute_query(query)
-        return [r["datasource"] for r in results]
+        results = await self.execute_query_values(_Q_GET_DATASOURCES)
+        return [row[0] for row in results]
     
     async def get_datasource(self, name: str, include_password: bool = False) -> Optional[Dict[str, Any]]:
         """특정 DataSource 조회"""
         if include_password:
-            query = """
-            MATCH (ds:DataSource {name: $name})
-            OPTIONAL MATCH (ds)-[:HAS_SCHEMA]->(s:Schema)
-            WITH ds, COLLECT(s.name) as schemas
-            RETURN ds {
-                .name, .engine, .display_name, .host, .port, .database, .user, .password,
-                schemas: schemas,
-                created_at: toString(ds.created_at)
-            } AS datasource
-            """
+            query = _Q_GET_DATASOURCE_WITH_PW
         else:
-            query = """
-            MATCH (ds:DataSource {name: $name})
-            OPTIONAL MATCH (ds)-[:HAS_SCHEMA]->(s:Schema)
-            WITH ds, COLLECT(s.name) as schemas
-            RETURN ds {
-                .name, .engine, .display_name, .host, .port, .database, .user,
-                schemas: schemas,
-                created_at: toString(ds.created_at)
-            } AS datasource
-            """
-        results = await self.execute_query(query, {"name": name})
+            query = _Q_GET_DATASOURCE
+        results = await self.execute_query(query, {"name": name}, routing=RoutingControl.READ)
         return results[0]["datasource"] if results else None
     
     async def get_connection_params(self, name: str) -> Optional[Dict[str, Any]]:
         """DataSource의 연결 파라미터 조회 (비밀번호 포함)"""
-        query = """
-        MATCH (ds:DataSource {name: $name})
-        RETURN {
-            engine: ds.engine,
-            host: ds.host,
-            port: ds.port,
-            database: ds.database,
-            user: ds.user,
-            password: ds.password
-        } AS connection
-        """
-        results = await self.execute_query(query, {"name": name})
+        results = await self.execute_query(_Q_GET_CONNECTION_PARAMS, {"name": name}, routing=RoutingControl.READ)
         return results[0]["connection"] if results else None
     
+    async def get_all_connection_params(self) -> List[Dict[str, Any]]:
+        """모든 DataSource의 연결 파라미터 조회 (비밀번호 포함)"""
+        results = await self.execute_query_values(_Q_GET_ALL_CONNECTION_PARAMS)
+        return [row[0] for row in results]
+    
     async def delete_datasource(self, name: str) -> bool:
         """DataSource 삭제 (연결된 Schema, Table, Column도 함께 삭제)"""
-        query = """
-        MATCH (ds:DataSource {name: $name})
-        OPTIONAL MATCH (ds)-[:HAS_SCHEMA]->(s:Schema)
-        OPTIONAL MATCH (s)-[:HAS_TABLE]->(t:Table)
-        OPTIONAL MATCH (t)-[:HAS_COLUMN]->(c:Column)
-        DETACH DELETE ds, s, t, c
-        RETURN COUNT(*) as deleted
-        """
-        results = await self.execute_query(query, {"name": name})
+        results = await self.execute_query(_Q_DELETE_DATASOURCE, {"name": name})
         return results[0]["deleted"] > 0 if results else False
     
     async def update_datasource(
@@ -174,50 +371,33 @@ class Neo4jService:
         display_name: str = None
     ) -> Optional[Dict[str, Any]]:
         """DataSource 업데이트 (비밀번호 포함)"""
-        set_clauses = ["ds.updated_at = datetime()"]
         params = {"name": name}
         
         if engine:
-            set_clauses.append("ds.engine = $engine")
             params["engine"] = engine
         if display_name:
-            set_clauses.append("ds.display_name = $display_name")
             params["display_name"] = display_name
         if parameters:
-            for key, value in parameters.items():
-                # 비밀번호도 저장 (TODO: 프로덕션에서는 암호화 필요)
-                set_clauses.append(f"ds.{key} = ${key}")
-                params[key] = value
+            # 비밀번호도 저장 (TODO: 프로덕션에서는 암호화 필요)
+            params.update(parameters)
         
-        query = f"""
-        MATCH (ds:DataSource {{name: $name}})
-        SET {', '.join(set_clauses)}
-        RETURN ds {{
-            .name, .engine, .display_name, .host, .port, .database, .user,
-            updated_at: toString(ds.updated_at)
-        }} AS datasource
-        """
+        query = _build_update_query(tuple(sorted(k for k in params if k != "name")))
         results = await self.execute_query(query, params)
         return results[0]["datasource"] if results else None
     
+    async def bump_schema_version(self, name: str) -> Optional[int]:
+        """메타데이터 추출 완료 시 DataSource의 schema_version 증가"""
+        results = await self.execute_query(_Q_BUMP_SCHEMA_VERSION, {"name": name})
+        return results[0]["schema_version"] if results else None
+    
     # ========================================
     # Schema Operations (DataSource -> Schema)
     # ========================================
     
     async def get_schemas(self, datasource_name: str) -> List[Dict[str, Any]]:
         """DataSource에 속한 Schema 목록 조회"""
-        query = """
-        MATCH (ds:DataSource {name: $datasource_name})-[:HAS_SCHEMA]->(s:Schema)
-        OPTIONAL MATCH (s)-[:HAS_TABLE]->(t:Table)
-        WITH s, COUNT(t) as table_count
-        RETURN s {
-            .name, .description,
-            table_count: table_count
-        } AS schema
-        ORDER BY s.name
-        """
-        results = await self.execute_query(query, {"datasource_name": datasource_name})
-        return [r["schema"] for r in results]
+        results = await self.execute_query_values(_Q_GET_SCHEMAS, {"datasource_name": datasource_name})
+        return [row[0] for row in results]
     
     async def create_schema(
         self,
@@ -226,15 +406,7 @@ class Neo4jService:
         description: str = None
     ) -> Dict[str, Any]:
         """Schema 노드 생성 및 DataSource에 연결"""
-        query = """
-        MATCH (ds:DataSource {name: $datasource_name})
-        MERGE (s:Schema {name: $schema_name})
-        SET s.description = $description,
-            s.created_at = datetime()
-        MERGE (ds)-[:HAS_SCHEMA]->(s)
-        RETURN s {.name, .description} AS schema
-        """
-        results = await self.execute_query(query, {
+        results = await self.execute_query(_Q_CREATE_SCHEMA, {
             "datasource_name": datasource_name,
             "schema_name": schema_name,
             "description": description or ""
@@ -248,49 +420,77 @@ class Neo4jService:
     async def get_tables(self, datasource_name: str, schema_name: str = None) -> List[Dict[str, Any]]:
         """DataSource/Schema에 속한 Table 목록 조회"""
         if schema_name:
-            query = """
-            MATCH (ds:DataSource {name: $datasource_name})-[:HAS_SCHEMA]->(s:Schema {name: $schema_name})-[:HAS_TABLE]->(t:Table)
-            OPTIONAL MATCH (t)-[:HAS_COLUMN]->(c:Column)
-            WITH t, COUNT(c) as column_count
-            RETURN t {
-                .name, .description, .schema,
-                column_count: column_count
-            } AS table
-            ORDER BY t.name
-            """
+            query = _Q_GET_TABLES_BY_SCHEMA
             params = {"datasource_name": datasource_name, "schema_name": schema_name}
         else:
-            query = """
-            MATCH (ds:DataSource {name: $datasource_name})-[:HAS_SCHEMA]->(s:Schema)-[:HAS_TABLE]->(t:Table)
-            OPTIONAL MATCH (t)-[:HAS_COLUMN]->(c:Column)
-            WITH t, s, COUNT(c) as column_count
-            RETURN t {
-                .name, .description,
-                schema: s.name,
-                column_count: column_count
-            } AS table
-            ORDER BY s.name, t.name
-            """
+            query = _Q_GET_TABLES
             params = {"datasource_name": datasource_name}
         
-        results = await self.execute_query(query, params)
-        return [r["table"] for r in results]
+        results = await self.execute_query_values(query, params)
+        return [row[0] for row in results]
+    
+    # ========================================
+    # MaterializedView Operations
+    # ========================================
+    
+    async def upsert_materialized_view(
+        self,
+        name: str,
+        source_database: str,
+        source_table: str,
+        query: str,
+        indexes: List[str] = None,
+        refresh_every: str = None,
+        refresh_job: str = None
+    ) -> Optional[Dict[str, Any]]:
+        """MaterializedView 정의 저장 (원본 DataSource가 등록되어 있으면 연결)"""
+        results = await self.execute_query(_Q_UPSERT_MATERIALIZED_VIEW, {
+            "name": name,
+            "source_database": source_database,
+            "source_table": source_table,
+            "query": query,
+            "indexes": indexes or [],
+            "refresh_every": refresh_every,
+            "refresh_job": refresh_job
+        })
+        return results[0]["materialized_view"] if results else None
+    
+    async def get_refreshed_materialized_views(self) -> List[Dict[str, Any]]:
+        """갱신 JOB이 등록된 MaterializedView 정의 목록"""
+        results = await self.execute_query_values(_Q_GET_REFRESHED_MATERIALIZED_VIEWS)
+        return [row[0] for row in results]
     
     # ========================================
     # Constraint & Index Setup
     # ========================================
     
+    async def ensure_table_key(self) -> None:
+        """Table (schema, name) 키 생성 - Enterprise는 NODE KEY 제약조건, Community는 복합 인덱스"""
+        rows = await self.execute_query_values(_Q_SERVER_EDITION)
+        enterprise = any(row[0] == "enterprise" for row in rows)
+        for query in _TABLE_KEY_ENTERPRISE if enterprise else _TABLE_KEY_COMMUNITY:
+            await self.execute_query(query)
+    
     async def ensure_constraints(self):
-        """DataSource 관련 제약조건 생성"""
+        """DataSource/Schema/Table/Column 관련 제약조건 및 인덱스 생성"""
         constraints = [
             "CREATE CONSTRAINT datasource_name IF NOT EXISTS FOR (ds:DataSource) REQUIRE ds.name IS UNIQUE",
+            "CREATE CONSTRAINT materialized_view_name IF NOT EXISTS FOR (mv:MaterializedView) REQUIRE mv.name IS UNIQUE",
+            # 라벨 스캔 대신 인덱스 탐색이 되도록 조회 키에 인덱스 생성
+            "CREATE INDEX schema_name IF NOT EXISTS FOR (s:Schema) ON (s.name)",
+            "CREATE INDEX column_table IF NOT EXISTS FOR (c:Column) ON (c.table, c.name)",
         ]
         
         for query in constraints:
             try:
                 await self.execute_query(query)
-            except Exception:
-                pass  # 이미 존재할 수 있음
+            except Exception as e:
+                logger.warning(f"Failed to create Neo4j constraint/index ({query}): {e}")
+        
+        try:
+            await self.ensure_table_key()
+        except Exception as e:
+            logger.warning(f"Failed to create Neo4j Table key: {e}")
 
 
 # Singleton 인스턴스
@@ -5,11 +5,22 @@ OpenMetadata 스타일의 데이터 소스 메타데이터 추출 서비스
 데이터베이스에 연결하여 테이블, 컬럼, 외래키 등의 메타데이터를 추출합니다.
 """
 import asyncio
+import hashlib
 import logging
+import os
+import re
+import tempfile
+import time
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from itertools import groupby, islice
+from operator import itemgetter
 from typing import Any, AsyncGenerator, Dict, List, Optional
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+
+import orjson
+from neo4j.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +29,7 @@ logger = logging.getLogger(__name__)
 # 데이터 모델
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ColumnMetadata:
     """컬럼 메타데이터"""
     name: str
@@ -34,7 +45,7 @@ class ColumnMetadata:
     numeric_scale: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ForeignKeyMetadata:
     """외래키 메타데이터"""
     name: str
@@ -46,7 +57,7 @@ class ForeignKeyMetadata:
     target_column: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TableMetadata:
     """테이블 메타데이터"""
     name: str
@@ -57,6 +68,19 @@ class TableMetadata:
     row_count: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    
+    @property
+    def columns_soa(self) -> Dict[str, list]:
+        """컬럼 목록을 필드별 리스트로 반환 (대량 저장/직렬화용)"""
+        return columns_to_soa(self.columns)
+
+
+_COLUMN_FIELDS = tuple(f.name for f in fields(ColumnMetadata))
+
+
+def columns_to_soa(columns: List[ColumnMetadata]) -> Dict[str, list]:
+    """ColumnMetadata 리스트(AoS)를 {필드명: [값, ...]} 형태(SoA)로 변환"""
+    return {name: [getattr(c, name) for c in columns] for name in _COLUMN_FIELDS}
 
 
 @dataclass
@@ -76,12 +100,12 @@ class DatabaseMetadata:
     port: Optional[int] = None
     schemas: List[SchemaMetadata] = field(default_factory=list)
     foreign_keys: List[ForeignKeyMetadata] = field(default_factory=list)
-    extracted_at: datetime = field(default_factory=datetime.utcnow)
+    extracted_at: Optional[datetime] = None  # 추출 시작 시점 (UTC), 추출 진입점에서 전달
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionProgress:
-    """추출 진행 상황"""
+    """추출 진행 상황 (tables 단계는 한 인스턴스를 갱신하며 재사용 - 보관하려면 dataclasses.replace로 복사)"""
     phase: str
     message: str
     progress: int  # 0-100
@@ -96,16 +120,39 @@ class ExtractionProgress:
 # 데이터베이스 어댑터 기본 클래스
 # ============================================================================
 
+# tables 단계 진행 메시지 (스키마명, 처리 수, 전체 수)
+_MSG_SCHEMA_DONE = "스키마 '%s' 처리 완료 (%d/%d)"
+
+
 class DatabaseAdapter(ABC):
     """데이터베이스 어댑터 기본 클래스 (OpenMetadata 스타일)"""
     
     def __init__(self, connection_params: Dict[str, Any]):
         self.connection_params = connection_params
         self.connection = None
+        self._use_sync = False  # 비동기 드라이버가 없어 동기 드라이버로 대체 연결한 경우 True
+    
+    async def _fetch(self, query: str, *args):
+        """쿼리 실행 후 전체 행 반환 - connect()에서 _fetch_async / _fetch_sync로 교체"""
+        raise RuntimeError(f"{self.__class__.__name__} is not connected")
+    
+    @abstractmethod
+    def _execute_sync(self, query: str, args: tuple):
+        """동기 드라이버로 쿼리 실행 (_fetch_sync가 스레드에서 호출)"""
+        pass
+    
+    async def _fetch_sync(self, query: str, *args):
+        """동기 드라이버 쿼리를 이벤트 루프를 막지 않도록 스레드에서 실행"""
+        return await asyncio.to_thread(self._execute_sync, query, args)
+    
+    @property
+    def concurrent_queries(self) -> bool:
+        """이 어댑터 하나로 쿼리를 동시에 실행할 수 있는지 (연결 풀을 쓰는 어댑터에서 True)"""
+        return False
     
     @abstractmethod
-    async def connect(self) -> bool:
-        """데이터베이스 연결"""
+    async def connect(self, max_connections: int = 8) -> bool:
+        """데이터베이스 연결 (max_connections: 자체 연결 풀을 쓰는 어댑터의 풀 크기 상한)"""
         pass
     
     @abstractmethod
@@ -118,6 +165,11 @@ class DatabaseAdapter(ABC):
         """연결 테스트"""
         pass
     
+    @abstractmethod
+    async def ping(self) -> None:
+        """연결된 상태에서 간단한 왕복 쿼리 실행 (SELECT 1)"""
+        pass
+    
     @abstractmethod
     async def get_schemas(self) -> List[str]:
         """스키마 목록 조회"""
@@ -134,15 +186,116 @@ class DatabaseAdapter(ABC):
         pass
     
     @abstractmethod
-    async def get_foreign_keys(self, schema: str = None) -> List[ForeignKeyMetadata]:
-        """외래키 조회"""
+    async def get_foreign_keys(self, schemas: List[str] = None) -> List[ForeignKeyMetadata]:
+        """외래키 조회 (schemas 지정 시 해당 스키마들만, 단일 쿼리)"""
         pass
     
+    async def catalog_fingerprint(self, schemas: List[str] = None) -> Optional[str]:
+        """
+        카탈로그(DDL) 변경 감지용 지문 - 테이블/컬럼/제약조건/코멘트가 바뀌면 값이 달라짐
+        
+        전체 추출 없이 한 번의 쿼리로 계산합니다. 지원하지 않는 어댑터는 None을 반환합니다.
+        """
+        return None
+    
+    async def get_columns_bulk(self, schema: str, table: str = None) -> Dict[str, List[ColumnMetadata]]:
+        """스키마의 컬럼을 테이블별로 조회 (기본 구현: 테이블마다 get_columns 호출, 어댑터에서 단일 쿼리로 재정의)"""
+        if table:
+            return {table: await self.get_columns(schema, table)}
+        return {t.name: await self.get_columns(schema, t.name) for t in await self.get_tables(schema)}
+    
+    async def extract_schema(self, schema_name: str, include_columns: bool = True) -> SchemaMetadata:
+        """
+        단일 스키마의 테이블 및 컬럼 추출
+        
+        동시 쿼리가 가능한 어댑터(연결 풀)는 테이블 목록과 컬럼 일괄 조회를 동시에 보내 왕복 대기를 겹치고,
+        그 외에는 연결 하나로 순차 실행합니다.
+        """
+        if include_columns and self.concurrent_queries:
+            tables, columns_by_table = await asyncio.gather(
+                self.get_tables(schema_name),
+                self.get_columns_bulk(schema_name),
+                return_exceptions=True
+            )
+            if isinstance(tables, BaseException):
+                raise tables
+        else:
+            tables = await self.get_tables(schema_name)
+            columns_by_table = None
+            if include_columns and tables:
+                try:
+                    columns_by_table = await self.get_columns_bulk(schema_name)
+                except Exception as e:
+                    columns_by_table = e
+        
+        if isinstance(columns_by_table, BaseException):
+            logger.warning(f"컬럼 조회 실패: {schema_name}: {columns_by_table}")
+        elif columns_by_table:
+            for table in tables:
+                table.columns = columns_by_table.get(table.name, [])
+        return SchemaMetadata(name=schema_name, tables=tables)
+    
+    async def extract_schemas_parallel(
+        self,
+        schemas: List[str],
+        include_columns: bool = True,
+        max_concurrency: int = 4,
+        progress_queue: Optional[asyncio.Queue] = None
+    ) -> List[Optional[SchemaMetadata]]:
+        """
+        여러 스키마를 동시에 추출 (입력 순서대로 반환, 실패한 스키마는 None)
+        
+        하나의 연결에서는 쿼리를 동시에 실행할 수 없으므로 최대 max_concurrency개의 연결을 풀로 두고,
+        스키마마다 연결을 하나씩 빌려 테이블 목록 + 컬럼 일괄 조회를 실행합니다 (풀 크기가 동시성 상한).
+        첫 연결은 이미 연결된 self를 쓰고, 나머지는 같은 파라미터로 새 어댑터를 연결합니다.
+        스키마 하나가 끝날 때마다 progress_queue에 (schema_name, SchemaMetadata | None)을 넣습니다.
+        """
+        slots = min(max_concurrency, max(len(schemas), 1))
+        # 자체 연결 풀이 있는 어댑터는 추가 어댑터 없이 self를 slots번 빌려줌
+        extra = 0 if self.concurrent_queries else slots - 1
+        clones = [self.__class__(self.connection_params) for _ in range(extra)]
+        outcomes = await asyncio.gather(*(c.connect() for c in clones), return_exceptions=True)
+        connected = [c for c, o in zip(clones, outcomes) if not isinstance(o, BaseException)]
+        for o in outcomes:
+            if isinstance(o, Exception):
+                logger.warning(f"추가 연결 생성 실패 (남은 연결로 계속 진행): {o}")
+        
+        pool: asyncio.Queue = asyncio.Queue()
+        for adapter in ([self] * slots if self.concurrent_queries else [self, *connected]):
+            pool.put_nowait(adapter)
+        
+        async def borrow(fn):
+            adapter = await pool.get()
+            try:
+                return await fn(adapter)
+            finally:
+                pool.put_nowait(adapter)
+        
+        async def one(schema_name: str) -> Optional[SchemaMetadata]:
+            schema_meta = None
+            try:
+                schema_meta = await borrow(lambda a: a.extract_schema(schema_name, include_columns))
+            except Exception as e:
+                logger.error(f"스키마 처리 실패: {schema_name}: {e}")
+            if progress_queue is not None:
+                progress_queue.put_nowait((schema_name, schema_meta))
+            return schema_meta
+        
+        try:
+            return list(await asyncio.gather(*(one(s) for s in schemas)))
+        finally:
+            for adapter in connected:
+                try:
+                    await adapter.disconnect()
+                except Exception as e:
+                    logger.debug(f"추가 연결 해제 실패: {e}")
+    
     async def extract_metadata(
         self, 
         schemas: List[str] = None,
         include_columns: bool = True,
-        include_foreign_keys: bool = True
+        include_foreign_keys: bool = True,
+        extracted_at: Optional[datetime] = None
     ) -> AsyncGenerator[tuple[ExtractionProgress, Optional[DatabaseMetadata]], None]:
         """
         메타데이터 추출 (스트리밍)
@@ -152,7 +305,8 @@ class DatabaseAdapter(ABC):
             name=self.connection_params.get('database', 'unknown'),
             engine=self.__class__.__name__.replace('Adapter', '').lower(),
             host=self.connection_params.get('host'),
-            port=self.connection_params.get('port')
+            port=self.connection_params.get('port'),
+            extracted_at=extracted_at or datetime.now(timezone.utc)
         )
         
         try:
@@ -175,6 +329,7 @@ class DatabaseAdapter(ABC):
             all_schemas = await self.get_schemas()
             target_schemas = schemas if schemas else all_schemas
             total_schemas = len(target_schemas)
+            pct_per_schema = 60.0 / total_schemas if total_schemas else 0
             
             yield ExtractionProgress(
                 phase="schemas",
@@ -183,51 +338,52 @@ class DatabaseAdapter(ABC):
                 total_schemas=total_schemas
             ), None
             
-            # 테이블 및 컬럼 추출
+            # 테이블 및 컬럼 추출 (스키마 단위 병렬, 진행 상황은 큐로 수신)
             all_tables_count = 0
-            processed_tables = 0
+            processed_schemas = 0
+            last_pct = None
+            # 스키마마다 새 이벤트를 만들지 않고 한 인스턴스의 필드만 갱신
+            tables_progress = ExtractionProgress(
+                phase="tables",
+                message="",
+                progress=20,
+                total_schemas=total_schemas
+            )
+            progress_queue: asyncio.Queue = asyncio.Queue()
+            task = asyncio.create_task(self.extract_schemas_parallel(
+                target_schemas,
+                include_columns=include_columns,
+                progress_queue=progress_queue
+            ))
+            task.add_done_callback(lambda _: progress_queue.put_nowait(None))
             
-            for idx, schema_name in enumerate(target_schemas):
-                yield ExtractionProgress(
-                    phase="tables",
-                    message=f"스키마 '{schema_name}' 처리 중...",
-                    progress=20 + int(60 * idx / total_schemas),
-                    total_schemas=total_schemas,
-                    processed_schemas=idx
-                ), None
+            try:
+                while True:
+                    item = await progress_queue.get()
+                    if item is None:
+                        break
+                    schema_name, schema_meta = item
+                    processed_schemas += 1
+                    if schema_meta:
+                        all_tables_count += len(schema_meta.tables)
+                    # 진행률(%)이 바뀔 때만 이벤트 생성 (스키마가 많을 때 불필요한 할당/전송 방지)
+                    pct = 20 + int(pct_per_schema * processed_schemas)
+                    if pct == last_pct:
+                        continue
+                    last_pct = pct
+                    tables_progress.message = _MSG_SCHEMA_DONE % (schema_name, processed_schemas, total_schemas)
+                    tables_progress.progress = pct
+                    tables_progress.processed_schemas = processed_schemas
+                    tables_progress.total_tables = all_tables_count
+                    tables_progress.processed_tables = all_tables_count
+                    yield tables_progress, None
                 
-                try:
-                    tables = await self.get_tables(schema_name)
-                    schema_meta = SchemaMetadata(name=schema_name, tables=[])
-                    
-                    for table in tables:
-                        all_tables_count += 1
-                        
-                        if include_columns:
-                            try:
-                                columns = await self.get_columns(schema_name, table.name)
-                                table.columns = columns
-                            except Exception as e:
-                                logger.warning(f"컬럼 조회 실패: {schema_name}.{table.name}: {e}")
-                        
-                        schema_meta.tables.append(table)
-                        processed_tables += 1
-                        
-                        if processed_tables % 10 == 0:
-                            yield ExtractionProgress(
-                                phase="tables",
-                                message=f"테이블 처리 중: {processed_tables}/{all_tables_count}",
-                                progress=20 + int(60 * (idx + 0.5) / total_schemas),
-                                total_schemas=total_schemas,
-                                processed_schemas=idx,
-                                total_tables=all_tables_count,
-                                processed_tables=processed_tables
-                            ), None
-                    
-                    result.schemas.append(schema_meta)
-                    
-                except Exception as e:
-                    logger.error(f"스키마 처리 실패: {schema_name}: {e}")
+                schema_results = await task
+            finally:
+                if not task.done():
+                    task.cancel()
+            
+            result.schemas = [s for s in schema_results if s is not None]
             
             # 외래키 추출
             if include_foreign_keys:
@@ -242,9 +398,8 @@ class DatabaseAdapter(ABC):
                 ), None
                 
                 try:
-                    for schema_name in target_schemas:
-                        fks = await self.get_foreign_keys(schema_name)
-                        result.foreign_keys.extend(fks)
+                    if target_schemas:
+                        result.foreign_keys = await self.get_foreign_keys(target_schemas)
                 except Exception as e:
                     logger.warning(f"외래키 추출 실패: {e}")
             
@@ -275,24 +430,42 @@ class DatabaseAdapter(ABC):
 # PostgreSQL 어댑터
 # ============================================================================
 
+# asyncpg 스타일 플레이스홀더 ($1, $2, ...)
+_PG_PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+
+
 class PostgreSQLAdapter(DatabaseAdapter):
     """PostgreSQL 메타데이터 추출 어댑터"""
     
-    async def connect(self) -> bool:
+    def __init__(self, connection_params: Dict[str, Any]):
+        super().__init__(connection_params)
+        self.pool = None  # asyncpg 연결 풀 (psycopg2 대체 경로에서는 self.connection 사용)
+    
+    @property
+    def concurrent_queries(self) -> bool:
+        return self.pool is not None
+    
+    async def connect(self, max_connections: int = 8) -> bool:
         try:
             import asyncpg
-            self.connection = await asyncpg.connect(
+            # 스키마별 병렬 추출 쿼리가 서버에서 실제로 동시에 실행되도록 연결 풀 사용
+            self.pool = await asyncpg.create_pool(
                 host=self.connection_params.get('host', 'localhost'),
                 port=self.connection_params.get('port', 5432),
                 user=self.connection_params.get('user'),
                 password=self.connection_params.get('password'),
-                database=self.connection_params.get('database')
+                database=self.connection_params.get('database'),
+                min_size=min(2, max_connections),
+                max_size=max_connections,
+                statement_cache_size=256
             )
+            self._fetch = self._fetch_async
             return True
         except ImportError:
-            # Fallback to psycopg2
+            # Fallback to psycopg2 (블로킹 호출은 모두 스레드에서 실행)
             import psycopg2
-            self.connection = psycopg2.connect(
+            self.connection = await asyncio.to_thread(
+                psycopg2.connect,
                 host=self.connection_params.get('host', 'localhost'),
                 port=self.connection_params.get('port', 5432),
                 user=self.connection_params.get('user'),
@@ -300,14 +473,15 @@ class PostgreSQLAdapter(DatabaseAdapter):
                 dbname=self.connection_params.get('database')
             )
             self._use_sync = True
+            self._fetch = self._fetch_sync
             return True
     
     async def disconnect(self) -> None:
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
         if self.connection:
-            if hasattr(self, '_use_sync') and self._use_sync:
-                self.connection.close()
-            else:
-                await self.connection.close()
+            await asyncio.to_thread(self.connection.close)
             self.connection = None
     
     async def test_connection(self) -> tuple[bool, Optional[str]]:
@@ -318,16 +492,27 @@ class PostgreSQLAdapter(DatabaseAdapter):
         except Exception as e:
             return False, str(e)
     
-    async def _execute(self, query: str, *args):
-        """쿼리 실행 (동기/비동기 호환)"""
-        if hasattr(self, '_use_sync') and self._use_sync:
-            cursor = self.connection.cursor()
-            cursor.execute(query, args if args else None)
-            result = cursor.fetchall()
+    async def ping(self) -> None:
+        await self._fetch("SELECT 1")
+    
+    def _execute_sync(self, query: str, args: tuple):
+        """psycopg2 실행 - $n 플레이스홀더를 %(pn)s로 바꿔 바인딩 (같은 번호 반복 사용 가능)"""
+        cursor = self.connection.cursor()
+        try:
+            if args:
+                cursor.execute(
+                    _PG_PLACEHOLDER_RE.sub(r"%(p\1)s", query),
+                    {f"p{i}": arg for i, arg in enumerate(args, 1)}
+                )
+            else:
+                cursor.execute(query)
+            return cursor.fetchall()
+        finally:
             cursor.close()
-            return result
-        else:
-            return await self.connection.fetch(query, *args)
+    
+    async def _fetch_async(self, query: str, *args):
+        async with self.pool.acquire() as con:
+            return await con.fetch(query, *args)
     
     async def get_schemas(self) -> List[str]:
         query = """
@@ -336,8 +521,38 @@ class PostgreSQLAdapter(DatabaseAdapter):
             WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
             ORDER BY schema_name
         """
-        rows = await self._execute(query)
-        return [row[0] if isinstance(row, tuple) else row['schema_name'] for row in rows]
+        rows = await self._fetch(query)
+        return [row[0] for row in rows]
+    
+    async def catalog_fingerprint(self, schemas: List[str] = None) -> Optional[str]:
+        """pg_class/pg_attribute/pg_constraint/pg_description 행의 개수와 xmin 합 (DDL마다 카탈로그 행이 새로 기록됨)"""
+        if schemas:
+            schema_filter = "n.nspname = ANY($1::text[])"
+            args = (list(schemas),)
+        else:
+            schema_filter = "n.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_toast')"
+            args = ()
+        query = f"""
+            WITH rel AS (
+                SELECT c.oid, c.xmin
+                FROM pg_catalog.pg_class c
+                JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relkind IN ('r', 'p', 'v', 'm', 'f')
+                AND {schema_filter}
+            )
+            SELECT concat_ws(':',
+                (SELECT count(*) || '/' || coalesce(sum(xmin::text::bigint), 0) FROM rel),
+                (SELECT count(*) || '/' || coalesce(sum(a.xmin::text::bigint), 0)
+                 FROM pg_catalog.pg_attribute a JOIN rel ON rel.oid = a.attrelid
+                 WHERE a.attnum > 0),
+                (SELECT count(*) || '/' || coalesce(sum(k.xmin::text::bigint), 0)
+                 FROM pg_catalog.pg_constraint k JOIN rel ON rel.oid = k.conrelid),
+                (SELECT count(*) || '/' || coalesce(sum(d.xmin::text::bigint), 0)
+                 FROM pg_catalog.pg_description d JOIN rel ON rel.oid = d.objoid)
+            )
+        """
+        rows = await self._fetch(query, *args)
+        return rows[0][0] if rows else None
     
     async def get_tables(self, schema: str) -> List[TableMetadata]:
         query = """
@@ -350,34 +565,27 @@ class PostgreSQLAdapter(DatabaseAdapter):
             AND t.table_type IN ('BASE TABLE', 'VIEW')
             ORDER BY t.table_name
         """
+        rows = await self._fetch(query, schema)
         
-        if hasattr(self, '_use_sync') and self._use_sync:
-            cursor = self.connection.cursor()
-            cursor.execute(query.replace('$1', '%s'), (schema,))
-            rows = cursor.fetchall()
-            cursor.close()
-        else:
-            rows = await self.connection.fetch(query, schema)
-        
-        tables = []
-        for row in rows:
-            if isinstance(row, tuple):
-                name, table_type, desc = row[0], row[1], row[2] if len(row) > 2 else None
-            else:
-                name, table_type, desc = row['table_name'], row['table_type'], row.get('description')
-            
-            tables.append(TableMetadata(
-                name=name,
+        # asyncpg Record와 psycopg2 tuple 모두 인덱스 접근 가능 - 드라이버별 분기 불필요
+        return [
+            TableMetadata(
+                name=row[0],
                 schema=schema,
-                table_type='VIEW' if 'VIEW' in table_type else 'TABLE',
-                description=desc
-            ))
-        
-        return tables
+                table_type='VIEW' if 'VIEW' in row[1] else 'TABLE',
+                description=row[2]
+            )
+            for row in rows
+        ]
     
     async def get_columns(self, schema: str, table: str) -> List[ColumnMetadata]:
+        return (await self.get_columns_bulk(schema, table)).get(table, [])
+    
+    async def get_columns_bulk(self, schema: str, table: str = None) -> Dict[str, List[ColumnMetadata]]:
+        """스키마 전체(또는 지정 테이블)의 컬럼을 단일 쿼리로 조회하여 테이블별로 묶음"""
         query = """
             SELECT 
+                c.table_name,
                 c.column_name,
                 c.data_type,
                 c.is_nullable,
@@ -386,66 +594,52 @@ class PostgreSQLAdapter(DatabaseAdapter):
                 c.character_maximum_length,
                 c.numeric_precision,
                 c.numeric_scale,
-                col_description((quote_ident($1) || '.' || quote_ident($2))::regclass, c.ordinal_position) as description,
+                col_description((quote_ident(c.table_schema) || '.' || quote_ident(c.table_name))::regclass, c.ordinal_position) as description,
                 CASE WHEN pk.column_name IS NOT NULL THEN true ELSE false END as is_primary_key
             FROM information_schema.columns c
             LEFT JOIN (
-                SELECT kcu.column_name
+                SELECT kcu.table_name, kcu.column_name
                 FROM information_schema.table_constraints tc
                 JOIN information_schema.key_column_usage kcu 
                     ON tc.constraint_name = kcu.constraint_name 
                     AND tc.table_schema = kcu.table_schema
+                    AND tc.table_name = kcu.table_name
                 WHERE tc.constraint_type = 'PRIMARY KEY'
                 AND tc.table_schema = $1
-                AND tc.table_name = $2
-            ) pk ON c.column_name = pk.column_name
-            WHERE c.table_schema = $1 AND c.table_name = $2
-            ORDER BY c.ordinal_position
+            ) pk ON c.table_name = pk.table_name AND c.column_name = pk.column_name
+            WHERE c.table_schema = $1
         """
+        args = (schema,)
+        if table:
+            query += " AND c.table_name = $2"
+            args = (schema, table)
+        query += " ORDER BY c.table_name, c.ordinal_position"
+        rows = await self._fetch(query, *args)
         
-        if hasattr(self, '_use_sync') and self._use_sync:
-            cursor = self.connection.cursor()
-            sync_query = query.replace('$1', '%s').replace('$2', '%s')
-            cursor.execute(sync_query, (schema, table, schema, table, schema, table))
-            rows = cursor.fetchall()
-            cursor.close()
-        else:
-            rows = await self.connection.fetch(query, schema, table)
-        
-        columns = []
-        for row in rows:
-            if isinstance(row, tuple):
-                columns.append(ColumnMetadata(
-                    name=row[0],
-                    data_type=row[1],
-                    nullable=row[2] == 'YES',
-                    default_value=row[3],
-                    ordinal_position=row[4],
-                    max_length=row[5],
-                    numeric_precision=row[6],
-                    numeric_scale=row[7],
-                    description=row[8] if len(row) > 8 else None,
-                    primary_key=row[9] if len(row) > 9 else False
-                ))
-            else:
-                columns.append(ColumnMetadata(
-                    name=row['column_name'],
-                    data_type=row['data_type'],
-                    nullable=row['is_nullable'] == 'YES',
-                    default_value=row['column_default'],
-                    ordinal_position=row['ordinal_position'],
-                    max_length=row['character_maximum_length'],
-                    numeric_precision=row['numeric_precision'],
-                    numeric_scale=row['numeric_scale'],
-                    description=row.get('description'),
-                    primary_key=row.get('is_primary_key', False)
-                ))
-        
-        return columns
-    
-    async def get_foreign_keys(self, schema: str = None) -> List[ForeignKeyMetadata]:
+        # asyncpg Record와 psycopg2 tuple 모두 인덱스 접근 가능
+        # (정렬 규칙에 따라 같은 테이블 행이 떨어져 나올 수 있으므로 setdefault로 누적)
+        columns_by_table: Dict[str, List[ColumnMetadata]] = {}
+        for table_name, group in groupby(rows, key=itemgetter(0)):
+            columns_by_table.setdefault(table_name, []).extend(
+                ColumnMetadata(
+                    name=row[1],
+                    data_type=row[2],
+                    nullable=row[3] == 'YES',
+                    default_value=row[4],
+                    ordinal_position=row[5],
+                    max_length=row[6],
+                    numeric_precision=row[7],
+                    numeric_scale=row[8],
+                    description=row[9],
+                    primary_key=bool(row[10])
+                )
+                for row in group
+            )
+        return columns_by_table
+    
+    async def get_foreign_keys(self, schemas: List[str] = None) -> List[ForeignKeyMetadata]:
         query = """
-            SELECT
+            SELECT 
                 tc.constraint_name,
                 tc.table_schema as source_schema,
                 tc.table_name as source_table,
@@ -463,53 +657,42 @@ class PostgreSQLAdapter(DatabaseAdapter):
             WHERE tc.constraint_type = 'FOREIGN KEY'
         """
         
-        if schema:
-            query += f" AND tc.table_schema = '{schema}'"
+        args = ()
+        if schemas:
+            query += " AND tc.table_schema = ANY($1::text[])"
+            args = (list(schemas),)
         
         query += " ORDER BY tc.constraint_name"
+        rows = await self._fetch(query, *args)
         
-        if hasattr(self, '_use_sync') and self._use_sync:
-            cursor = self.connection.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            cursor.close()
-        else:
-            rows = await self.connection.fetch(query)
-        
-        foreign_keys = []
-        for row in rows:
-            if isinstance(row, tuple):
-                foreign_keys.append(ForeignKeyMetadata(
-                    name=row[0],
-                    source_schema=row[1],
-                    source_table=row[2],
-                    source_column=row[3],
-                    target_schema=row[4],
-                    target_table=row[5],
-                    target_column=row[6]
-                ))
-            else:
-                foreign_keys.append(ForeignKeyMetadata(
-                    name=row['constraint_name'],
-                    source_schema=row['source_schema'],
-                    source_table=row['source_table'],
-                    source_column=row['source_column'],
-                    target_schema=row['target_schema'],
-                    target_table=row['target_table'],
-                    target_column=row['target_column']
-                ))
-        
-        return foreign_keys
+        # SELECT 컬럼 순서 = ForeignKeyMetadata 필드 순서 (Record/tuple 모두 언패킹 가능)
+        return [ForeignKeyMetadata(*row) for row in rows]
 
 
 # ============================================================================
 # MySQL 어댑터
 # ============================================================================
 
+def _mysql_ident(name: str) -> str:
+    """MySQL 식별자 백틱 인용 (SHOW 문은 파라미터 바인딩 불가)"""
+    return "`" + name.replace("`", "``") + "`"
+
+
+# SHOW FULL COLUMNS의 Type 값 - varchar(255), decimal(10,2) unsigned, enum('a','b') ...
+_MYSQL_TYPE_RE = re.compile(r"^(\w+)(?:\((\d+)(?:,(\d+))?\))?")
+_MYSQL_CHAR_TYPES = frozenset({"char", "varchar", "binary", "varbinary"})
+# int(11) 등의 괄호 값은 표시 폭이므로 정밀도로 쓰지 않음
+_MYSQL_PRECISION_TYPES = frozenset({"decimal", "numeric", "float", "double"})
+
+
 class MySQLAdapter(DatabaseAdapter):
     """MySQL 메타데이터 추출 어댑터"""
     
-    async def connect(self) -> bool:
+    # SHOW FULL TABLES/COLUMNS 사용 여부 (거부하는 호환 엔진이면 False로 바꾸고 INFORMATION_SCHEMA 사용)
+    _use_show = True
+    
+    async def connect(self, max_connections: int = 8) -> bool:
+        # 연결 하나만 사용하므로 max_connections는 무시
         try:
             import aiomysql
             self.connection = await aiomysql.connect(
@@ -519,6 +702,7 @@ class MySQLAdapter(DatabaseAdapter):
                 password=self.connection_params.get('password'),
                 db=self.connection_params.get('database')
             )
+            self._fetch = self._fetch_async
             return True
         except ImportError:
             import pymysql
@@ -530,14 +714,12 @@ class MySQLAdapter(DatabaseAdapter):
                 database=self.connection_params.get('database')
             )
             self._use_sync = True
+            self._fetch = self._fetch_sync
             return True
     
     async def disconnect(self) -> None:
         if self.connection:
-            if hasattr(self, '_use_sync') and self._use_sync:
-                self.connection.close()
-            else:
-                self.connection.close()
+            self.connection.close()
             self.connection = None
     
     async def test_connection(self) -> tuple[bool, Optional[str]]:
@@ -548,19 +730,23 @@ class MySQLAdapter(DatabaseAdapter):
         except Exception as e:
             return False, str(e)
     
-    async def _execute(self, query: str):
-        if hasattr(self, '_use_sync') and self._use_sync:
-            cursor = self.connection.cursor()
-            cursor.execute(query)
-            result = cursor.fetchall()
+    async def ping(self) -> None:
+        await self._fetch("SELECT 1")
+    
+    def _execute_sync(self, query: str, args: tuple):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, args if args else None)
+            return cursor.fetchall()
+        finally:
             cursor.close()
-            return result
-        else:
-            # aiomysql uses async context manager for cursor
-            async with self.connection.cursor() as cursor:
-                await cursor.execute(query)
-                result = await cursor.fetchall()
-                return result
+    
+    async def _fetch_async(self, query: str, *args):
+        """aiomysql 실행 (%s 플레이스홀더 바인딩)"""
+        # aiomysql uses async context manager for cursor
+        async with self.connection.cursor() as cursor:
+            await cursor.execute(query, args if args else None)
+            return await cursor.fetchall()
     
     async def get_schemas(self) -> List[str]:
         query = """
@@ -569,21 +755,65 @@ class MySQLAdapter(DatabaseAdapter):
             WHERE SCHEMA_NAME NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
             ORDER BY SCHEMA_NAME
         """
-        rows = await self._execute(query)
+        rows = await self._fetch(query)
         return [row[0] for row in rows]
     
-    async def get_tables(self, schema: str) -> List[TableMetadata]:
+    async def catalog_fingerprint(self, schemas: List[str] = None) -> Optional[str]:
+        """테이블/컬럼/외래키 정의의 개수와 CRC32 합 (INFORMATION_SCHEMA 집계 한 번)"""
+        if schemas:
+            schema_filter = f"TABLE_SCHEMA IN ({', '.join(['%s'] * len(schemas))})"
+            schema_args = tuple(schemas)
+        else:
+            schema_filter = "TABLE_SCHEMA NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')"
+            schema_args = ()
         query = f"""
+            SELECT CONCAT_WS(':',
+                (SELECT CONCAT(COUNT(*), '/', COALESCE(SUM(CRC32(CONCAT_WS('|',
+                    TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE, CREATE_TIME, TABLE_COMMENT))), 0))
+                 FROM INFORMATION_SCHEMA.TABLES WHERE {schema_filter}),
+                (SELECT CONCAT(COUNT(*), '/', COALESCE(SUM(CRC32(CONCAT_WS('|',
+                    TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, COLUMN_TYPE,
+                    IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT, COLUMN_COMMENT))), 0))
+                 FROM INFORMATION_SCHEMA.COLUMNS WHERE {schema_filter}),
+                (SELECT CONCAT(COUNT(*), '/', COALESCE(SUM(CRC32(CONCAT_WS('|',
+                    CONSTRAINT_NAME, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME,
+                    REFERENCED_TABLE_SCHEMA, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME))), 0))
+                 FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+                 WHERE REFERENCED_TABLE_NAME IS NOT NULL AND {schema_filter})
+            )
+        """
+        rows = await self._fetch(query, *(schema_args * 3))
+        return rows[0][0] if rows else None
+    
+    async def get_tables(self, schema: str) -> List[TableMetadata]:
+        # SHOW FULL TABLES는 데이터 딕셔너리만 읽어 INFORMATION_SCHEMA.TABLES보다 훨씬 빠름 (테이블 코멘트는 없음)
+        if self._use_show:
+            try:
+                rows = await self._fetch(f"SHOW FULL TABLES FROM {_mysql_ident(schema)}")
+                return [
+                    TableMetadata(
+                        name=row[0],
+                        schema=schema,
+                        table_type='VIEW' if 'VIEW' in row[1] else 'TABLE'
+                    )
+                    for row in sorted(rows, key=itemgetter(0))
+                    if row[1] in ('BASE TABLE', 'VIEW')
+                ]
+            except Exception as e:
+                logger.info(f"SHOW FULL TABLES failed, falling back to INFORMATION_SCHEMA: {e}")
+                self._use_show = False
+        
+        query = """
             SELECT 
                 TABLE_NAME,
                 TABLE_TYPE,
                 TABLE_COMMENT
             FROM INFORMATION_SCHEMA.TABLES
-            WHERE TABLE_SCHEMA = '{schema}'
+            WHERE TABLE_SCHEMA = %s
             AND TABLE_TYPE IN ('BASE TABLE', 'VIEW')
             ORDER BY TABLE_NAME
         """
-        rows = await self._execute(query)
+        rows = await self._fetch(query, schema)
         
         tables = []
         for row in rows:
@@ -597,8 +827,48 @@ class MySQLAdapter(DatabaseAdapter):
         return tables
     
     async def get_columns(self, schema: str, table: str) -> List[ColumnMetadata]:
-        query = f"""
+        if self._use_show:
+            try:
+                rows = await self._fetch(
+                    f"SHOW FULL COLUMNS FROM {_mysql_ident(schema)}.{_mysql_ident(table)}"
+                )
+                return [self._show_column(position, row) for position, row in enumerate(rows, 1)]
+            except Exception as e:
+                logger.info(f"SHOW FULL COLUMNS failed, falling back to INFORMATION_SCHEMA: {e}")
+                self._use_show = False
+        return (await self.get_columns_bulk(schema, table)).get(table, [])
+    
+    @staticmethod
+    def _show_column(position: int, row: tuple) -> ColumnMetadata:
+        """SHOW FULL COLUMNS 행 (Field, Type, Collation, Null, Key, Default, Extra, Privileges, Comment) 변환"""
+        match = _MYSQL_TYPE_RE.match(row[1])
+        data_type = match.group(1).lower() if match else row[1]
+        size = int(match.group(2)) if match and match.group(2) else None
+        is_char = data_type in _MYSQL_CHAR_TYPES
+        has_precision = data_type in _MYSQL_PRECISION_TYPES
+        return ColumnMetadata(
+            name=row[0],
+            data_type=data_type,
+            nullable=row[3] == 'YES',
+            primary_key=row[4] == 'PRI',
+            unique=row[4] == 'UNI',
+            default_value=row[5],
+            description=row[8] if row[8] else None,
+            ordinal_position=position,
+            max_length=size if is_char else None,
+            numeric_precision=size if has_precision else None,
+            numeric_scale=int(match.group(3)) if has_precision and match.group(3) else None
+        )
+    
+    async def get_columns_bulk(self, schema: str, table: str = None) -> Dict[str, List[ColumnMetadata]]:
+        """
+        스키마 전체(또는 지정 테이블)의 컬럼을 단일 쿼리로 조회하여 테이블별로 묶음
+        
+        스키마 전체는 테이블마다 SHOW FULL COLUMNS를 보내는 것보다 한 번의 조회가 왕복이 적어 INFORMATION_SCHEMA 유지
+        """
+        query = """
             SELECT 
+                TABLE_NAME,
                 COLUMN_NAME,
                 DATA_TYPE,
                 IS_NULLABLE,
@@ -610,31 +880,37 @@ class MySQLAdapter(DatabaseAdapter):
                 COLUMN_COMMENT,
                 COLUMN_KEY
             FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{table}'
-            ORDER BY ORDINAL_POSITION
+            WHERE TABLE_SCHEMA = %s
         """
-        rows = await self._execute(query)
+        args = (schema,)
+        if table:
+            query += " AND TABLE_NAME = %s"
+            args = (schema, table)
+        query += " ORDER BY TABLE_NAME, ORDINAL_POSITION"
+        rows = await self._fetch(query, *args)
         
-        columns = []
-        for row in rows:
-            columns.append(ColumnMetadata(
-                name=row[0],
-                data_type=row[1],
-                nullable=row[2] == 'YES',
-                default_value=row[3],
-                ordinal_position=row[4],
-                max_length=row[5],
-                numeric_precision=row[6],
-                numeric_scale=row[7],
-                description=row[8] if row[8] else None,
-                primary_key=row[9] == 'PRI'
-            ))
-        
-        return columns
+        columns_by_table: Dict[str, List[ColumnMetadata]] = {}
+        for table_name, group in groupby(rows, key=itemgetter(0)):
+            columns_by_table.setdefault(table_name, []).extend(
+                ColumnMetadata(
+                    name=row[1],
+                    data_type=row[2],
+                    nullable=row[3] == 'YES',
+                    default_value=row[4],
+                    ordinal_position=row[5],
+                    max_length=row[6],
+                    numeric_precision=row[7],
+                    numeric_scale=row[8],
+                    description=row[9] if row[9] else None,
+                    primary_key=row[10] == 'PRI'
+                )
+                for row in group
+            )
+        return columns_by_table
     
-    async def get_foreign_keys(self, schema: str = None) -> List[ForeignKeyMetadata]:
+    async def get_foreign_keys(self, schemas: List[str] = None) -> List[ForeignKeyMetadata]:
         query = """
-            SELECT
+            SELECT 
                 CONSTRAINT_NAME,
                 TABLE_SCHEMA as source_schema,
                 TABLE_NAME as source_table,
@@ -646,11 +922,13 @@ class MySQLAdapter(DatabaseAdapter):
             WHERE REFERENCED_TABLE_NAME IS NOT NULL
         """
         
-        if schema:
-            query += f" AND TABLE_SCHEMA = '{schema}'"
+        args = ()
+        if schemas:
+            query += f" AND TABLE_SCHEMA IN ({', '.join(['%s'] * len(schemas))})"
+            args = tuple(schemas)
         
         query += " ORDER BY CONSTRAINT_NAME"
-        rows = await self._execute(query)
+        rows = await self._fetch(query, *args)
         
         foreign_keys = []
         for row in rows:
@@ -680,11 +958,13 @@ class AdapterFactory:
         'mysql': MySQLAdapter,
         'mariadb': MySQLAdapter,
     }
+    _supported: Optional[frozenset] = None
     
     @classmethod
     def register(cls, engine_type: str, adapter_class: type):
         """어댑터 등록"""
         cls._adapters[engine_type.lower()] = adapter_class
+        cls._supported = None
     
     @classmethod
     def get_adapter(cls, engine_type: str, connection_params: Dict[str, Any]) -> Optional[DatabaseAdapter]:
@@ -698,27 +978,390 @@ class AdapterFactory:
     def supported_engines(cls) -> List[str]:
         """지원하는 엔진 목록"""
         return list(cls._adapters.keys())
+    
+    @classmethod
+    def supported_engine_set(cls) -> frozenset:
+        """지원하는 엔진 집합 (멤버십 검사용, register 시 갱신)"""
+        if cls._supported is None:
+            cls._supported = frozenset(cls._adapters)
+        return cls._supported
+
+
+# ============================================================================
+# 어댑터 연결 풀
+# ============================================================================
+
+class AdapterPool:
+    """연결된 어댑터 재사용 풀 (헬스체크 시 매번 연결/해제하지 않도록)"""
+    
+    def __init__(self, max_size: int = 4, max_idle: float = 300.0):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._idle: Dict[tuple, asyncio.Queue] = {}
+        # 대여 중인 어댑터 -> 풀 키 (반환 시 어느 큐로 돌려보낼지)
+        self._leased: Dict[DatabaseAdapter, tuple] = {}
+        # 유휴 어댑터가 있는 동안 만료된 연결을 주기적으로 해제하는 태스크
+        self._sweeper: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    def _key(engine: str, connection_params: Dict[str, Any]) -> tuple:
+        return (
+            engine.lower(),
+            connection_params.get('host'),
+            connection_params.get('port'),
+            connection_params.get('database'),
+            connection_params.get('user'),
+            connection_params.get('password'),
+        )
+    
+    async def _checkout(self, engine: str, connection_params: Dict[str, Any]) -> Optional[DatabaseAdapter]:
+        """유휴 어댑터 반환 (만료/끊긴 연결은 폐기), 없으면 새로 연결"""
+        key = self._key(engine, connection_params)
+        queue = self._idle.get(key)
+        
+        while queue is not None and not queue.empty():
+            adapter, released_at = queue.get_nowait()
+            if time.monotonic() - released_at > self.max_idle:
+                await self._discard(adapter)
+                continue
+            try:
+                await adapter.ping()
+            except Exception:
+                await self._discard(adapter)
+                continue
+            self._leased[adapter] = key
+            return adapter
+        
+        adapter = AdapterFactory.get_adapter(engine, connection_params)
+        if not adapter:
+            return None
+        # 헬스체크/지문 조회는 단일 쿼리이므로 연결 하나만 사용 (유휴 어댑터가 서버 연결을 여러 개 붙잡지 않도록)
+        await adapter.connect(max_connections=1)
+        self._leased[adapter] = key
+        return adapter
+    
+    @asynccontextmanager
+    async def acquire(self, engine: str, connection_params: Dict[str, Any]):
+        """어댑터 대여 - 정상 종료 시 풀에 반환, 오류 시 폐기"""
+        adapter = await self._checkout(engine, connection_params)
+        try:
+            yield adapter
+        except BaseException:
+            if adapter:
+                await self._discard(adapter)
+            raise
+        else:
+            if adapter:
+                await self.release(adapter)
+    
+    async def release(self, adapter: DatabaseAdapter) -> None:
+        """어댑터 반환 (풀이 가득 차거나 이 풀에서 빌린 어댑터가 아니면 연결 해제)"""
+        key = self._leased.pop(adapter, None)
+        if key is None:
+            await self._discard(adapter)
+            return
+        queue = self._idle.setdefault(key, asyncio.Queue())
+        if queue.qsize() >= self.max_size:
+            await self._discard(adapter)
+            return
+        queue.put_nowait((adapter, time.monotonic()))
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+    
+    async def _sweep_loop(self) -> None:
+        """유휴 어댑터가 남아 있는 동안 max_idle/2 주기로 sweep (모두 비면 종료, 다음 반환 시 재시작)"""
+        while self._idle:
+            await asyncio.sleep(self.max_idle / 2)
+            await self.sweep()
+    
+    async def sweep(self) -> None:
+        """
+        max_idle을 넘긴 유휴 어댑터 연결 해제
+        
+        체크아웃 시에만 만료를 확인하면 다시 쓰이지 않는 어댑터(PostgreSQL은 연결 풀)가 연결을 계속 붙잡으므로
+        체크아웃과 무관하게 정리합니다.
+        """
+        now = time.monotonic()
+        for key, queue in list(self._idle.items()):
+            alive = []
+            while not queue.empty():
+                adapter, released_at = queue.get_nowait()
+                if now - released_at > self.max_idle:
+                    await self._discard(adapter)
+                else:
+                    alive.append((adapter, released_at))
+            for item in alive:
+                queue.put_nowait(item)
+            if queue.empty() and self._idle.get(key) is queue:
+                del self._idle[key]
+    
+    async def _discard(self, adapter: DatabaseAdapter) -> None:
+        self._leased.pop(adapter, None)
+        try:
+            await adapter.disconnect()
+        except Exception as e:
+            logger.debug(f"어댑터 연결 해제 실패: {e}")
+    
+    async def close(self) -> None:
+        """모든 유휴 어댑터 연결 해제"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        idle, self._idle = self._idle, {}
+        for queue in idle.values():
+            while not queue.empty():
+                adapter, _ = queue.get_nowait()
+                await self._discard(adapter)
 
 
 # ============================================================================
 # 스키마 인트로스펙션 서비스
 # ============================================================================
 
+# Neo4j 일괄 저장 시 한 트랜잭션에 보내는 최대 행 수
+_STORE_BATCH_SIZE = 10000
+# CALL { ... } IN TRANSACTIONS 사용 시 서버 측 서브 트랜잭션 크기
+_STORE_TX_ROWS = 5000
+
+# _store_to_neo4j의 MERGE/MATCH 키 - 없으면 행마다 라벨 전체 스캔 (O(N) → 인덱스 탐색)
+# Table (schema, name) 키는 서버 에디션에 따라 달라지므로 Neo4jService.ensure_table_key로 생성
+_STORE_INDEXES = (
+    "CREATE CONSTRAINT column_fqn IF NOT EXISTS FOR (c:Column) REQUIRE c.fqn IS UNIQUE",
+    "CREATE INDEX schema_name_db IF NOT EXISTS FOR (s:Schema) ON (s.name, s.db)",
+)
+
+# _store_to_neo4j Cypher 쿼리 (모듈 로드 시 한 번만 생성 - 매 호출 동일 문자열로 서버 플랜 캐시 재사용)
+_Q_MERGE_SCHEMA = """
+MATCH (ds:DataSource {name: $datasource_name})
+UNWIND $rows AS r
+MERGE (s:Schema {name: r.name, db: $database})
+SET s.description = r.description
+MERGE (ds)-[:HAS_SCHEMA]->(s)
+"""
+
+_Q_MERGE_TABLE = """
+UNWIND $rows AS r
+MATCH (s:Schema {name: r.schema, db: $database})
+MERGE (t:Table {name: r.name, schema: r.schema})
+SET t.table_type = r.table_type,
+    t.description = r.description,
+    t.db = $database,
+    t.datasource = $datasource_name
+MERGE (s)-[:HAS_TABLE]->(t)
+"""
+
+# Column 1행 저장 (UNWIND 본문 / CALL { ... } IN TRANSACTIONS 서브쿼리 공용)
+# 컬럼은 필드별 리스트(SoA) 파라미터로 받고 인덱스 i로 접근 - 행마다 맵을 만들지 않음
+_COLUMN_MERGE_BODY = """
+MATCH (t:Table {name: $tables[i], schema: $schemas[i]})
+MERGE (c:Column {fqn: $fqns[i]})
+ON CREATE SET 
+    c.name = $names[i],
+    c.table = $tables[i],
+    c.schema = $schemas[i]
+SET c.type = $data_types[i],
+    c.nullable = $nullables[i],
+    c.primary_key = $primary_keys[i],
+    c.description = $descriptions[i],
+    c.ordinal_position = $ordinal_positions[i],
+    c.datasource = $datasource_name
+MERGE (t)-[:HAS_COLUMN]->(c)
+"""
+
+_Q_MERGE_COLUMN = "UNWIND range(0, size($fqns) - 1) AS i" + _COLUMN_MERGE_BODY
+
+_Q_MERGE_COLUMN_IN_TRANSACTIONS = f"""
+UNWIND range(0, size($fqns) - 1) AS i
+CALL {{
+WITH i{_COLUMN_MERGE_BODY}}} IN TRANSACTIONS OF {_STORE_TX_ROWS} ROWS
+"""
+# 위 구문을 지원하지 않는 서버(4.x 등)가 돌려주는 오류 코드 - 이 경우에만 클라이언트 측 배치로 폴백
+_CIT_UNSUPPORTED_CODES = frozenset({
+    "Neo.ClientError.Statement.SyntaxError",
+    "Neo.ClientError.Statement.UnsupportedOperationError",
+})
+
+# Column 쿼리 파라미터명 -> ColumnMetadata 필드명 (fqns/schemas/tables는 테이블 단위로 채움)
+_COLUMN_PARAM_FIELDS = (
+    ("names", "name"),
+    ("data_types", "data_type"),
+    ("nullables", "nullable"),
+    ("primary_keys", "primary_key"),
+    ("descriptions", "description"),
+    ("ordinal_positions", "ordinal_position"),
+)
+
+_Q_MERGE_FK = """
+UNWIND $rows AS r
+MATCH (sc:Column {fqn: r.source_fqn})
+MATCH (tc:Column {fqn: r.target_fqn})
+MERGE (sc)-[rel:REFERENCES]->(tc)
+SET rel.constraint_name = r.constraint_name
+"""
+
+
+def _batched(rows: List[Any], size: int):
+    """rows를 size개씩 잘라 반환"""
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _batched_columns(columns: Dict[str, list], size: int):
+    """필드별 리스트(SoA)를 size행씩 잘라 반환"""
+    for start in range(0, len(columns["fqns"]), size):
+        yield {key: values[start:start + size] for key, values in columns.items()}
+
+
+# 추출 결과 디스크 캐시 (재추출 시 information_schema 재조회 방지)
+_DISK_CACHE_DIR = os.path.expanduser(os.getenv("RDF_CACHE_DIR", "~/.cache/rdf"))
+_DISK_CACHE_TTL = float(os.getenv("RDF_SCHEMA_CACHE_TTL", "900"))  # 초 (기본 15분)
+
+
+def _disk_cache_path(fingerprint: tuple) -> str:
+    key = hashlib.blake2b(repr(fingerprint).encode(), digest_size=16).hexdigest()
+    return os.path.join(_DISK_CACHE_DIR, f"{key}.json")
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _metadata_from_json(data: Dict[str, Any]) -> DatabaseMetadata:
+    """orjson으로 저장한 dict에서 DatabaseMetadata를 다시 구성 (datetime 필드는 ISO 문자열)"""
+    return DatabaseMetadata(
+        name=data["name"],
+        engine=data["engine"],
+        host=data["host"],
+        port=data["port"],
+        schemas=[
+            SchemaMetadata(
+                name=schema["name"],
+                description=schema["description"],
+                tables=[
+                    TableMetadata(**{
+                        **table,
+                        "columns": [ColumnMetadata(**column) for column in table["columns"]],
+                        "created_at": _parse_ts(table["created_at"]),
+                        "updated_at": _parse_ts(table["updated_at"]),
+                    })
+                    for table in schema["tables"]
+                ],
+            )
+            for schema in data["schemas"]
+        ],
+        foreign_keys=[ForeignKeyMetadata(**fk) for fk in data["foreign_keys"]],
+        extracted_at=_parse_ts(data["extracted_at"]),
+    )
+
+
+def _load_cached_metadata(path: str, catalog: Optional[str]) -> Optional[DatabaseMetadata]:
+    """TTL 이내이고 저장 시점의 카탈로그 지문이 catalog와 같은 캐시 파일이 있으면 DatabaseMetadata 반환"""
+    try:
+        st = os.stat(path)
+        # 다른 사용자가 만든 파일은 신뢰하지 않음
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            logger.warning(f"메타데이터 캐시 무시 (소유자 불일치): {path}")
+            return None
+        if time.time() - st.st_mtime > _DISK_CACHE_TTL:
+            return None
+        with open(path, "rb") as f:
+            cached = orjson.loads(f.read())
+        # TTL 이내라도 소스 DDL이 바뀌었으면 사용하지 않음
+        if cached.get("catalog") != catalog:
+            return None
+        return _metadata_from_json(cached["metadata"])
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"메타데이터 캐시 읽기 실패: {path}: {e}")
+        return None
+
+
+def _save_cached_metadata(path: str, catalog: Optional[str], metadata: DatabaseMetadata) -> None:
+    """(카탈로그 지문, 메타데이터)를 임시 파일에 쓴 뒤 교체 (동시 추출 시 반쯤 쓰인 파일을 읽지 않도록)"""
+    try:
+        cache_dir = os.path.dirname(path)
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps({"catalog": catalog, "metadata": metadata}, default=str))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"메타데이터 캐시 저장 실패: {path}: {e}")
+
+
 class SchemaIntrospectionService:
     """스키마 인트로스펙션 서비스"""
     
     def __init__(self, neo4j_service=None):
         self.neo4j_service = neo4j_service
+        # datasource_name -> {"version", "fingerprint", "catalog", "total_schemas", "total_tables"}
+        self._schema_cache: Dict[str, Dict[str, Any]] = {}
+        # 서버가 CALL { ... } IN TRANSACTIONS를 지원하는지 (None: 아직 모름, 4.x면 False)
+        self._call_in_transactions: Optional[bool] = None
+        # 저장용 인덱스/제약조건 생성 (한 번만, 실행 중인 이벤트 루프가 있으면 백그라운드로 시작)
+        self._index_task: Optional[asyncio.Task] = None
+        if neo4j_service:
+            try:
+                self._index_task = asyncio.get_running_loop().create_task(self._ensure_store_indexes())
+            except RuntimeError:
+                pass  # 루프 밖에서 생성된 경우 첫 저장 시 생성
+    
+    async def _ensure_store_indexes(self) -> None:
+        """Column.fqn 유니크 제약조건, Schema 조회 인덱스, Table 키 생성 (이미 있으면 no-op)"""
+        for query in _STORE_INDEXES:
+            try:
+                await self.neo4j_service.execute_query(query)
+            except Exception as e:
+                # 기존 데이터에 중복 fqn이 있으면 제약조건 생성이 실패할 수 있음 - 저장은 계속 진행
+                logger.warning(f"Failed to create Neo4j index ({query}): {e}")
+        try:
+            await self.neo4j_service.ensure_table_key()
+        except Exception as e:
+            logger.warning(f"Failed to create Neo4j Table key: {e}")
+    
+    def invalidate(self, datasource_name: str) -> None:
+        """DataSource 생성/연결 정보 변경/삭제 시 캐시된 추출 요약 폐기 (다음 추출은 DB에서 다시 읽음)"""
+        self._schema_cache.pop(datasource_name, None)
+    
+    @staticmethod
+    async def _catalog_fingerprint(
+        engine: str,
+        connection_params: Dict[str, Any],
+        schemas: List[str] = None
+    ) -> Optional[str]:
+        """풀의 연결된 어댑터로 카탈로그 지문 조회 (헬스체크와 연결 재사용)"""
+        async with adapter_pool.acquire(engine, connection_params) as adapter:
+            return await adapter.catalog_fingerprint(schemas) if adapter else None
+    
+    @staticmethod
+    def _fingerprint(engine: str, connection_params: Dict[str, Any], schemas: List[str] = None) -> tuple:
+        return (
+            engine.lower(),
+            connection_params.get('host'),
+            connection_params.get('port'),
+            connection_params.get('database'),
+            connection_params.get('user'),
+            tuple(sorted(schemas)) if schemas else None,
+        )
     
     async def extract_and_store(
         self,
         datasource_name: str,
         engine: str,
         connection_params: Dict[str, Any],
-        schemas: List[str] = None
+        schemas: List[str] = None,
+        force: bool = False,
+        force_refresh: bool = False
     ) -> AsyncGenerator[ExtractionProgress, None]:
         """
         메타데이터 추출 및 Neo4j 저장
+        
+        캐시는 소스 DB의 카탈로그 지문(catalog_fingerprint)이 저장 시점과 같을 때만 사용합니다.
+        DataSource의 schema_version과 카탈로그 지문이 마지막 추출 시점과 같으면 캐시된 요약을 반환하고,
+        그 외에는 디스크 캐시(_DISK_CACHE_TTL 이내)의 추출 결과가 있으면 DB 조회 없이 그것을 저장합니다.
+        force=True이면 모든 캐시를, force_refresh=True이면 디스크 캐시만 무시하고 DB에서 다시 추출합니다.
         """
         adapter = AdapterFactory.get_adapter(engine, connection_params)
         
@@ -731,12 +1374,67 @@ class SchemaIntrospectionService:
             )
             return
         
+        fingerprint = self._fingerprint(engine, connection_params, schemas)
+        version = None
+        if self.neo4j_service:
+            datasource = await self.neo4j_service.get_datasource(datasource_name)
+            version = datasource.get("schema_version") if datasource else None
+        
+        # 소스 DDL 변경 감지 - 지문 조회가 실패하면 캐시를 신뢰하지 않고 다시 추출
+        # (force면 결과를 쓸 일이 없으므로 소스 DB에 지문 조회용 연결을 열지 않음)
+        use_cache = not force
+        catalog = None
+        if use_cache:
+            try:
+                catalog = await self._catalog_fingerprint(engine, connection_params, schemas)
+            except Exception as e:
+                logger.warning(f"카탈로그 지문 조회 실패 (캐시 사용 안 함): {datasource_name}: {e}")
+                use_cache = False
+        
+        cached = self._schema_cache.get(datasource_name)
+        if (
+            use_cache
+            and cached
+            and version is not None
+            and cached["version"] == version
+            and cached["fingerprint"] == fingerprint
+            and cached["catalog"] == catalog
+        ):
+            yield ExtractionProgress(
+                phase="complete",
+                message="메타데이터 변경 없음 (캐시 사용)",
+                progress=100,
+                total_schemas=cached["total_schemas"],
+                processed_schemas=cached["total_schemas"],
+                total_tables=cached["total_tables"],
+                processed_tables=cached["total_tables"]
+            )
+            return
+        
         metadata = None
+        cache_path = _disk_cache_path(fingerprint)
+        if use_cache and not force_refresh:
+            metadata = await asyncio.to_thread(_load_cached_metadata, cache_path, catalog)
+            if metadata:
+                total_tables = sum(len(s.tables) for s in metadata.schemas)
+                yield ExtractionProgress(
+                    phase="tables",
+                    message="캐시된 메타데이터 사용 (DB 조회 생략)",
+                    progress=85,
+                    total_schemas=len(metadata.schemas),
+                    processed_schemas=len(metadata.schemas),
+                    total_tables=total_tables,
+                    processed_tables=total_tables
+                )
         
-        async for progress, result in adapter.extract_metadata(schemas=schemas):
-            yield progress
-            if result:
-                metadata = result
+        if metadata is None:
+            extracted_at = datetime.now(timezone.utc)
+            async for progress, result in adapter.extract_metadata(schemas=schemas, extracted_at=extracted_at):
+                yield progress
+                if result:
+                    metadata = result
+            if metadata:
+                await asyncio.to_thread(_save_cached_metadata, cache_path, catalog, metadata)
         
         if metadata and self.neo4j_service:
             yield ExtractionProgress(
@@ -745,16 +1443,27 @@ class SchemaIntrospectionService:
                 progress=90
             )
             
+            total_schemas = len(metadata.schemas)
+            total_tables = sum(len(s.tables) for s in metadata.schemas)
             try:
                 await self._store_to_neo4j(datasource_name, metadata)
+                new_version = await self.neo4j_service.bump_schema_version(datasource_name)
+                if new_version is not None:
+                    self._schema_cache[datasource_name] = {
+                        "version": new_version,
+                        "fingerprint": fingerprint,
+                        "catalog": catalog,
+                        "total_schemas": total_schemas,
+                        "total_tables": total_tables
+                    }
                 yield ExtractionProgress(
                     phase="complete",
                     message="메타데이터 저장 완료!",
                     progress=100,
-                    total_schemas=len(metadata.schemas),
-                    processed_schemas=len(metadata.schemas),
-                    total_tables=sum(len(s.tables) for s in metadata.schemas),
-                    processed_tables=sum(len(s.tables) for s in metadata.schemas)
+                    total_schemas=total_schemas,
+                    processed_schemas=total_schemas,
+                    total_tables=total_tables,
+                    processed_tables=total_tables
                 )
             except Exception as e:
                 logger.error(f"Neo4j 저장 실패: {e}")
@@ -770,6 +1479,11 @@ class SchemaIntrospectionService:
         if not self.neo4j_service:
             return
         
+        # 인덱스가 준비된 뒤에 MERGE (최초 1회만 대기, 이후에는 완료된 태스크)
+        if self._index_task is None:
+            self._index_task = asyncio.create_task(self._ensure_store_indexes())
+        await self._index_task
+        
         # 1. DataSource 노드 생성/업데이트
         await self.neo4j_service.create_datasource(
             name=datasource_name,
@@ -782,99 +1496,100 @@ class SchemaIntrospectionService:
             display_name=datasource_name
         )
         
-        # 2. Schema 및 관계 생성
+        # 2~5. Schema / Table / Column / FK를 종류별 UNWIND 쿼리로 일괄 저장
+        schema_rows = [
+            {"name": schema.name, "description": schema.description}
+            for schema in metadata.schemas
+        ]
+        table_rows = [
+            {
+                "schema": schema.name,
+                "name": table.name,
+                "table_type": table.table_type,
+                "description": table.description
+            }
+            for schema in metadata.schemas
+            for table in schema.tables
+        ]
+        # Column은 fqn 기준 MERGE (robo-analyzer와 일관성 유지) - fqn: schema.table.column (소문자)
+        # 테이블별 columns_soa(필드별 리스트)를 이어 붙여 SoA 파라미터로 전송 - 컬럼마다 dict를 만들지 않음
+        # 소문자 변환은 schema/table당 한 번만 하고 컬럼마다 prefix에 이어 붙임
+        columns: Dict[str, list] = {"fqns": [], "schemas": [], "tables": []}
+        columns.update((param, []) for param, _ in _COLUMN_PARAM_FIELDS)
         for schema in metadata.schemas:
-            await self.neo4j_service.execute_query(
-                """
-                MATCH (ds:DataSource {name: $datasource_name})
-                MERGE (s:Schema {name: $schema_name, db: $database})
-                SET s.description = $description
-                MERGE (ds)-[:HAS_SCHEMA]->(s)
-                """,
-                {
-                    "datasource_name": datasource_name,
-                    "schema_name": schema.name,
-                    "database": metadata.name,
-                    "description": schema.description
-                }
-            )
-            
-            # 3. Table 및 관계 생성
+            schema_lc = schema.name.lower()
             for table in schema.tables:
-                await self.neo4j_service.execute_query(
-                    """
-                    MATCH (s:Schema {name: $schema_name, db: $database})
-                    MERGE (t:Table {name: $table_name, schema: $schema_name})
-                    SET t.table_type = $table_type,
-                        t.description = $description,
-                        t.db = $database,
-                        t.datasource = $datasource_name
-                    MERGE (s)-[:HAS_TABLE]->(t)
-                    """,
-                    {
-                        "datasource_name": datasource_name,
-                        "schema_name": schema.name,
-                        "database": metadata.name,
-                        "table_name": table.name,
-                        "table_type": table.table_type,
-                        "description": table.description
-                    }
-                )
-                
-                # 4. Column 생성 (fqn 기준 MERGE - robo-analyzer와 일관성 유지)
-                for col in table.columns:
-                    # fqn 생성: schema.table.column (소문자)
-                    fqn = f"{schema.name}.{table.name}.{col.name}".lower()
-                    
-                    await self.neo4j_service.execute_query(
-                        """
-                        MATCH (t:Table {name: $table_name, schema: $schema_name})
-                        MERGE (c:Column {fqn: $fqn})
-                        ON CREATE SET 
-                            c.name = $column_name,
-                            c.table = $table_name,
-                            c.schema = $schema_name
-                        SET c.type = $data_type,
-                            c.nullable = $nullable,
-                            c.primary_key = $primary_key,
-                            c.description = $description,
-                            c.ordinal_position = $ordinal_position,
-                            c.datasource = $datasource_name
-                        MERGE (t)-[:HAS_COLUMN]->(c)
-                        """,
-                        {
-                            "fqn": fqn,
-                            "datasource_name": datasource_name,
-                            "table_name": table.name,
-                            "schema_name": schema.name,
-                            "column_name": col.name,
-                            "data_type": col.data_type,
-                            "nullable": col.nullable,
-                            "primary_key": col.primary_key,
-                            "description": col.description,
-                            "ordinal_position": col.ordinal_position
-                        }
-                    )
+                soa = table.columns_soa
+                count = len(soa["name"])
+                prefix = f"{schema_lc}.{table.name.lower()}."
+                columns["fqns"].extend([prefix + name.lower() for name in soa["name"]])
+                columns["schemas"].extend([schema.name] * count)
+                columns["tables"].extend([table.name] * count)
+                for param, field_name in _COLUMN_PARAM_FIELDS:
+                    columns[param].extend(soa[field_name])
+        # FK는 같은 테이블을 여러 번 참조하므로 schema.table prefix를 캐시
+        fqn_prefixes: Dict[tuple, str] = {}
+        
+        def fqn_prefix(schema_name: str, table_name: str) -> str:
+            key = (schema_name, table_name)
+            prefix = fqn_prefixes.get(key)
+            if prefix is None:
+                prefix = fqn_prefixes[key] = f"{schema_name}.{table_name}.".lower()
+            return prefix
+        
+        fk_rows = [
+            {
+                "source_fqn": fqn_prefix(fk.source_schema, fk.source_table) + fk.source_column.lower(),
+                "target_fqn": fqn_prefix(fk.target_schema, fk.target_table) + fk.target_column.lower(),
+                "constraint_name": fk.name
+            }
+            for fk in metadata.foreign_keys
+        ]
         
-        # 5. Foreign Key 관계 생성 (fqn 기준 매칭)
-        for fk in metadata.foreign_keys:
-            source_fqn = f"{fk.source_schema}.{fk.source_table}.{fk.source_column}".lower()
-            target_fqn = f"{fk.target_schema}.{fk.target_table}.{fk.target_column}".lower()
+        params = {"datasource_name": datasource_name, "database": metadata.name}
+        
+        # 저장 전체에서 세션(연결) 하나를 재사용 - 쿼리마다 세션을 열고 닫지 않음
+        async with self.neo4j_service.session() as session:
             
-            await self.neo4j_service.execute_query(
-                """
-                MATCH (sc:Column {fqn: $source_fqn})
-                MATCH (tc:Column {fqn: $target_fqn})
-                MERGE (sc)-[r:REFERENCES]->(tc)
-                SET r.constraint_name = $constraint_name
-                """,
-                {
-                    "source_fqn": source_fqn,
-                    "target_fqn": target_fqn,
-                    "constraint_name": fk.name
-                }
-            )
+            async def write_batches(query: str, batches) -> None:
+                # 트랜잭션 메모리 한도를 넘지 않도록 배치(_STORE_BATCH_SIZE 행)마다 커밋
+                for batch in batches:
+                    async with await session.begin_transaction() as tx:
+                        await tx.run(query, {**params, **batch})
+                        await tx.commit()
+            
+            # Schema/Table 노드는 한 트랜잭션으로 커밋
+            async with await session.begin_transaction() as tx:
+                for query, rows in ((_Q_MERGE_SCHEMA, schema_rows), (_Q_MERGE_TABLE, table_rows)):
+                    for batch in _batched(rows, _STORE_BATCH_SIZE):
+                        await tx.run(query, {**params, "rows": batch})
+                await tx.commit()
+            
+            # Column은 행 수가 가장 많으므로 전체를 한 번에 보내고 Neo4j 5의
+            # CALL { ... } IN TRANSACTIONS로 서버가 _STORE_TX_ROWS 행마다 커밋하게 함 (자동 커밋 트랜잭션 필요)
+            pending_columns = bool(columns["fqns"])
+            if pending_columns and self._call_in_transactions is not False:
+                try:
+                    result = await session.run(
+                        _Q_MERGE_COLUMN_IN_TRANSACTIONS, {**params, **columns}
+                    )
+                    await result.consume()
+                    self._call_in_transactions = True
+                    pending_columns = False
+                except ClientError as e:
+                    # 4.x 등 구문을 지원하지 않는 서버만 폴백 - 그 외 오류(네트워크, 제약 위반 등)는 호출자에게 전달
+                    if self._call_in_transactions or e.code not in _CIT_UNSUPPORTED_CODES:
+                        raise
+                    logger.warning(f"CALL IN TRANSACTIONS unavailable, falling back to client-side batching: {e}")
+                    self._call_in_transactions = False
+            
+            if pending_columns:
+                await write_batches(_Q_MERGE_COLUMN, _batched_columns(columns, _STORE_BATCH_SIZE))
+            
+            # FK는 Column 노드가 모두 저장된 뒤에 연결
+            await write_batches(_Q_MERGE_FK, ({"rows": batch} for batch in _batched(fk_rows, _STORE_BATCH_SIZE)))
 
 
 # 서비스 인스턴스
 schema_introspection_service = SchemaIntrospectionService()
+adapter_pool = AdapterPool()
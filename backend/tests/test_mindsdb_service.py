@@ -0,0 +1,162 @@
+"""MindsDBService SQL helper tests (no MindsDB server needed)"""
+import asyncio
+
+from app.services.mindsdb_service import MindsDBService
+
+
+def test_apply_limit_appends_to_select():
+    assert MindsDBService.apply_limit("SELECT * FROM t;", 10, 20) == "SELECT * FROM t LIMIT 10 OFFSET 20"
+
+
+def test_apply_limit_keeps_own_limit():
+    assert MindsDBService.apply_limit("SELECT * FROM t LIMIT 5", 10) == "SELECT * FROM t LIMIT 5"
+
+
+def test_apply_limit_not_swallowed_by_trailing_comment():
+    paged = MindsDBService.apply_limit("SELECT * FROM t -- latest rows", 1000)
+    assert paged.endswith(" LIMIT 1000")
+    assert "--" not in paged
+
+
+def test_apply_limit_strips_block_comment_and_semicolon():
+    paged = MindsDBService.apply_limit("SELECT * FROM t; /* note */", 5)
+    assert paged == "SELECT * FROM t LIMIT 5"
+
+
+def test_apply_limit_ignores_limit_in_literal():
+    paged = MindsDBService.apply_limit("SELECT * FROM t WHERE note = 'no limit'", 10)
+    assert paged == "SELECT * FROM t WHERE note = 'no limit' LIMIT 10"
+
+
+def test_apply_limit_keeps_comment_markers_inside_literal():
+    paged = MindsDBService.apply_limit("SELECT * FROM t WHERE c = 'a -- b'", 10)
+    assert paged == "SELECT * FROM t WHERE c = 'a -- b' LIMIT 10"
+
+
+def test_apply_limit_ignores_limit_in_comment():
+    paged = MindsDBService.apply_limit("SELECT * FROM t -- no LIMIT here", 10)
+    assert paged.endswith(" LIMIT 10")
+
+
+def test_stream_requires_order_by():
+    assert MindsDBService.stream_query_error("SELECT * FROM t") is not None
+    assert MindsDBService.stream_query_error("SELECT * FROM t ORDER BY id -- x") is None
+
+
+def test_stream_order_by_in_literal_or_comment_does_not_count():
+    assert MindsDBService.stream_query_error("SELECT * FROM t WHERE c = 'order by'") is not None
+    assert MindsDBService.stream_query_error("SELECT * FROM t -- ORDER BY id") is not None
+
+
+class _FakeService(MindsDBService):
+    """Returns a fixed number of rows per query and records the queries"""
+    
+    def __init__(self, rows_per_query):
+        super().__init__(base_url="http://mindsdb.invalid")
+        self.rows_per_query = rows_per_query
+        self.queries = []
+    
+    async def execute_query(self, query):
+        self.queries.append(query)
+        rows = [[i] for i in range(self.rows_per_query)]
+        return {"type": "table", "columns": ["id"], "data": rows, "row_count": len(rows),
+                "error": None, "execution_time": 0}
+
+
+async def _collect(service, query, chunk_size):
+    return [page async for page in service.execute_query_stream(query, chunk_size=chunk_size)]
+
+
+def test_stream_stops_when_page_exceeds_chunk_size():
+    service = _FakeService(rows_per_query=50)
+    pages = asyncio.run(_collect(service, "SELECT * FROM t ORDER BY id -- x", chunk_size=10))
+    assert len(pages) == 1
+    assert service.queries == ["SELECT * FROM t ORDER BY id LIMIT 10"]
+
+
+def test_stream_pages_until_short_page():
+    service = _FakeService(rows_per_query=10)
+    service_pages = []
+    
+    async def run():
+        async for page in service.execute_query_stream("SELECT * FROM t ORDER BY id", chunk_size=10):
+            service_pages.append(page)
+            if len(service.queries) == 3:
+                service.rows_per_query = 4
+    
+    asyncio.run(run())
+    assert [p["row_count"] for p in service_pages] == [10, 10, 10, 4]
+    assert service.queries[-1].endswith("LIMIT 10 OFFSET 30")
+
+
+class _SlowService(MindsDBService):
+    """execute_query blocks until released, to invalidate while a fetch is in flight"""
+    
+    def __init__(self):
+        super().__init__(base_url="http://mindsdb.invalid")
+        self.release = None
+        self.calls = 0
+    
+    async def execute_query(self, query):
+        self.calls += 1
+        await self.release.wait()
+        return {"type": "table", "columns": ["name"], "data": [["old"]], "row_count": 1,
+                "error": None, "execution_time": 0}
+
+
+def test_invalidate_during_fetch_does_not_cache_stale_result():
+    service = _SlowService()
+    
+    async def run():
+        service.release = asyncio.Event()
+        fetch = asyncio.ensure_future(service._cached_query(("databases",), "SHOW DATABASES"))
+        await asyncio.sleep(0)
+        service.invalidate_cache("db1")
+        assert ("databases",) not in service._meta_inflight
+        service.release.set()
+        await fetch
+    
+    asyncio.run(run())
+    assert ("databases",) not in service._meta_cache
+    assert service.calls == 1
+
+
+def test_fetch_is_shared_and_cached():
+    service = _SlowService()
+    
+    async def run():
+        service.release = asyncio.Event()
+        fetches = [asyncio.ensure_future(service._cached_query(("models",), "SHOW MODELS")) for _ in range(3)]
+        await asyncio.sleep(0)
+        service.release.set()
+        await asyncio.gather(*fetches)
+    
+    asyncio.run(run())
+    assert service.calls == 1
+    assert ("models",) in service._meta_cache
+    assert not service._meta_inflight
+
+
+def test_quote_accepts_unusual_names():
+    assert MindsDBService._quote("sales-db") == "`sales-db`"
+    assert MindsDBService._quote("판매") == "`판매`"
+    assert MindsDBService._quote("a`b") == "`a``b`"
+
+
+def test_cached_encoding_follows_metadata_cache_entry():
+    service = _FakeService(rows_per_query=2)
+    encodes = []
+    
+    def encode(databases):
+        encodes.append(databases)
+        return len(encodes)
+    
+    async def run():
+        first = await service.cached_encoding(("databases",), service.get_databases, encode)
+        second = await service.cached_encoding(("databases",), service.get_databases, encode)
+        service.invalidate_cache("db1")
+        third = await service.cached_encoding(("databases",), service.get_databases, encode)
+        return first, second, third
+    
+    assert asyncio.run(run()) == (1, 1, 2)
+    assert len(service.queries) == 2
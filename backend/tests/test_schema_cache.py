@@ -0,0 +1,43 @@
+"""Schema extraction disk cache tests"""
+import os
+from datetime import datetime, timezone
+
+from app.services import schema_introspection as si
+from app.services.schema_introspection import (
+    ColumnMetadata, DatabaseMetadata, ForeignKeyMetadata, SchemaMetadata, TableMetadata
+)
+
+
+def _metadata():
+    table = TableMetadata(
+        name="orders", schema="public",
+        columns=[ColumnMetadata(name="id", data_type="integer", primary_key=True, ordinal_position=1)],
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+    return DatabaseMetadata(
+        name="shop", engine="postgresql", host="db", port=5432,
+        schemas=[SchemaMetadata(name="public", tables=[table])],
+        foreign_keys=[ForeignKeyMetadata("fk", "public", "orders", "user_id", "public", "users", "id")],
+        extracted_at=datetime.now(timezone.utc)
+    )
+
+
+def test_cache_round_trip(tmp_path):
+    path = str(tmp_path / "rdf" / "entry.json")
+    metadata = _metadata()
+    si._save_cached_metadata(path, "catalog-1", metadata)
+    
+    assert si._load_cached_metadata(path, "catalog-1") == metadata
+    assert os.stat(tmp_path / "rdf").st_mode & 0o777 == 0o700
+
+
+def test_cache_ignored_when_catalog_changed(tmp_path):
+    path = str(tmp_path / "entry.json")
+    si._save_cached_metadata(path, "catalog-1", _metadata())
+    assert si._load_cached_metadata(path, "catalog-2") is None
+
+
+def test_cache_file_is_not_code(tmp_path):
+    path = tmp_path / "entry.json"
+    path.write_bytes(b"\x80\x04cos\nsystem\n.")  # pickle payload
+    assert si._load_cached_metadata(str(path), None) is None
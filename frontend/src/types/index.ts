@@ -65,10 +65,21 @@ export interface Model {
   engine?: string;
 }
 
+export interface MaterializedViewInfo {
+  name: string;
+  source_database?: string;
+  source_table?: string;
+  query?: string;
+  indexes: string[];
+  refresh_every?: string;
+  updated_at?: string;
+}
+
 export interface Job {
   name: string;
   schedule?: string;
   next_run?: string;
+  materialized_view?: MaterializedViewInfo | null;
 }
 
 export interface KnowledgeBase {
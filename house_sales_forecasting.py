@@ -3,13 +3,37 @@ House Sales Forecasting Tutorial
 https://docs.mindsdb.com/use-cases/predictive_analytics/house-sales-forecasting
 
 분기별 주택 판매 예측을 위한 시계열 모델 생성 및 테스트
+
+환경 변수:
+  MINDSDB_POOL_SIZE - MindsDB HTTP 연결 풀 크기 (기본 10). 동시에 실행하는 쿼리 수보다 작으면
+                      남는 쿼리가 연결을 기다리며 직렬화되므로 최소 동시 쿼리 수 이상으로 설정
 """
 
+import asyncio
+import aiohttp
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import os
+import sys
 import time
 
 BASE_URL = "http://127.0.0.1:47334/api/sql/query"
+# 연결 자체는 몇 초 안에 끝나야 하므로 연결/읽기 타임아웃을 분리 (죽은 서버는 바로 실패)
+CONNECT_TIMEOUT = 3.05
+
+# MindsDB HTTP 연결 풀 크기 - 동시 실행(run_queries_concurrently)하는 쿼리 수 이상으로 설정
+POOL_SIZE = int(os.getenv("MINDSDB_POOL_SIZE", "10"))
+
+# 모든 쿼리가 같은 keep-alive 연결을 재사용하도록 세션 공유 (쿼리마다 TCP 연결/해제 방지)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=POOL_SIZE,
+    pool_maxsize=POOL_SIZE,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+SESSION.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
 
 
 def run_query(query, description="", timeout=300):
@@ -22,13 +46,14 @@ def run_query(query, description="", timeout=300):
     print(f"   Query: {preview}..." if len(query.strip()) > 100 else f"   Query: {preview}")
     
     try:
-        response = requests.post(
+        # stream=True: 본문을 소켓에서 바로 bytes로 읽어 orjson에 전달 (중간 버퍼 복사 없음)
+        with SESSION.post(
             BASE_URL,
-            headers={"Content-Type": "application/json"},
-            json={"query": query},
-            timeout=timeout
-        )
-        result = response.json()
+            data=orjson.dumps({"query": query}),
+            timeout=(CONNECT_TIMEOUT, timeout),
+            stream=True
+        ) as response:
+            result = orjson.loads(response.raw.read(decode_content=True))
         
         if result.get("type") == "error":
             print(f"   ❌ Error: {result.get('error_message', 'Unknown error')[:200]}")
@@ -40,6 +65,9 @@ def run_query(query, description="", timeout=300):
         else:
             print(f"   ✅ OK")
             return result
+    except requests.exceptions.ConnectTimeout:
+        print(f"   ❌ Connect timeout - is MindsDB running at {BASE_URL}?")
+        return None
     except requests.exceptions.Timeout:
         print(f"   ⏳ Timeout - operation may still be running")
         return None
@@ -48,6 +76,54 @@ def run_query(query, description="", timeout=300):
         return None
 
 
+async def run_query_async(session, query, description="", timeout=300):
+    """
+    run_query의 aiohttp 버전 (서로 의존하지 않는 쿼리를 asyncio.gather로 동시에 실행할 때 사용)
+    
+    동시에 실행되는 쿼리의 출력이 섞이지 않도록 결과까지 모아서 한 번에 출력합니다.
+    """
+    lines = [f"\n🔹 {description}"] if description else []
+    preview = query.strip().replace('\n', ' ')[:100]
+    lines.append(f"   Query: {preview}..." if len(query.strip()) > 100 else f"   Query: {preview}")
+    
+    try:
+        async with session.post(
+            BASE_URL,
+            data=orjson.dumps({"query": query}),
+            timeout=aiohttp.ClientTimeout(connect=CONNECT_TIMEOUT, sock_read=timeout)
+        ) as response:
+            result = orjson.loads(await response.read())
+        
+        if result.get("type") == "error":
+            lines.append(f"   ❌ Error: {result.get('error_message', 'Unknown error')[:200]}")
+            result = None
+        elif result.get("type") == "table":
+            lines.append(f"   ✅ Success! Rows: {len(result.get('data', []))}")
+        else:
+            lines.append(f"   ✅ OK")
+        return result
+    except asyncio.TimeoutError:
+        lines.append(f"   ⏳ Timeout - operation may still be running")
+        return None
+    except Exception as e:
+        lines.append(f"   ❌ Exception: {e}")
+        return None
+    finally:
+        print("\n".join(lines))
+
+
+async def run_queries_concurrently(queries, timeout=300):
+    """(query, description) 목록을 한 aiohttp 세션에서 동시에 실행 - 결과는 입력 순서대로 반환"""
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=POOL_SIZE),
+        headers={"Content-Type": "application/json"},
+        timeout=aiohttp.ClientTimeout(connect=CONNECT_TIMEOUT, sock_read=timeout)
+    ) as session:
+        return await asyncio.gather(*(
+            run_query_async(session, query, description, timeout) for query, description in queries
+        ))
+
+
 def format_table(result, max_rows=10):
     """Format table result for display"""
     if not result or result.get("type") != "table":
@@ -60,46 +136,83 @@ def format_table(result, max_rows=10):
         print("   (No data)")
         return
     
-    # Calculate column widths
-    widths = [max(len(str(c)), max(len(str(row[i])) for row in data[:max_rows])) for i, c in enumerate(columns)]
-    widths = [min(w, 20) for w in widths]  # Cap at 20 chars
+    # 셀마다 str()은 한 번만 (폭 계산과 출력에 재사용)
+    str_cols = [str(c) for c in columns]
+    str_rows = [[str(v) for v in row] for row in data[:max_rows]]
     
-    # Print header
-    header = " | ".join(str(c)[:w].ljust(w) for c, w in zip(columns, widths))
-    print(f"\n   {header}")
-    print("   " + "-" * len(header))
+    # Calculate column widths (Cap at 20 chars)
+    widths = [min(20, max(len(c), *(len(r[i]) for r in str_rows))) for i, c in enumerate(str_cols)]
     
-    # Print rows
-    for row in data[:max_rows]:
-        row_str = " | ".join(str(v)[:w].ljust(w) for v, w in zip(row, widths))
-        print(f"   {row_str}")
+    # 헤더/구분선/행을 모아 한 번에 출력 (행마다 print하지 않음)
+    header = " | ".join(c[:w].ljust(w) for c, w in zip(str_cols, widths))
+    lines = ["", f"   {header}", "   " + "-" * len(header)]
+    lines.extend(
+        "   " + " | ".join(v[:w].ljust(w) for v, w in zip(row, widths))
+        for row in str_rows
+    )
     
     if len(data) > max_rows:
-        print(f"   ... and {len(data) - max_rows} more rows")
+        lines.append(f"   ... and {len(data) - max_rows} more rows")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def split_result(result, key_column):
+    """table 결과를 key_column 값별로 나눔 (key_column은 제외, 행 순서 유지)"""
+    if not result or result.get("type") != "table":
+        return {}
+    
+    columns = result.get("column_names", [])
+    lowered = [str(c).lower() for c in columns]
+    if key_column.lower() not in lowered:
+        print(f"   ❌ Error: '{key_column}' 컬럼이 결과에 없습니다 (columns: {columns})")
+        return {}
+    key_idx = lowered.index(key_column.lower())
+    rest = [i for i in range(len(columns)) if i != key_idx]
+    
+    groups = {}
+    for row in result.get("data", []):
+        groups.setdefault(row[key_idx], []).append([row[i] for i in rest])
+    
+    sub_columns = [columns[i] for i in rest]
+    return {
+        key: {"type": "table", "column_names": sub_columns, "data": rows}
+        for key, rows in groups.items()
+    }
 
 
 def check_model_status(model_name, max_wait=600):
-    """Check model status and wait for completion"""
+    """
+    모델 훈련이 끝날 때까지 DESCRIBE로 상태 확인
+    
+    고정 10초 대신 1초부터 1.7배씩 늘려(최대 15초) 폴링하므로 빨리 끝나는 훈련은 바로 감지하고,
+    오래 걸리는 훈련은 DESCRIBE 호출 수가 줄어듭니다.
+    Returns: "complete" / "error" / None (max_wait 초과)
+    """
     print(f"\n   ⏳ Waiting for model '{model_name}' to complete training...")
     
     start_time = time.time()
+    delay = 1.0
+    status_idx = None  # DESCRIBE 결과 컬럼 구성은 폴링 중 바뀌지 않으므로 한 번만 찾음
     while time.time() - start_time < max_wait:
         result = run_query(f"DESCRIBE {model_name}", "")
         
         if result and result.get("type") == "table" and result.get("data"):
-            status = result["data"][0][1] if len(result["data"][0]) > 1 else "unknown"
-            print(f"   Status: {status}")
+            # 데이터 구조에 따라 상태 추출
+            data = result["data"][0]
+            if status_idx is None:
+                columns = result.get("column_names", [])
+                status_idx = columns.index("STATUS") if "STATUS" in columns else 1  # 두 번째 컬럼이 보통 상태
+            status = data[status_idx] if len(data) > status_idx else None
+            print(f"   🔄 Model Status: {status}")
             
-            if status == "complete":
-                return True
-            elif status == "error":
-                print(f"   ❌ Model training failed!")
-                return False
+            status = (status or "").lower()
+            if status in ("complete", "error"):
+                return status
         
-        time.sleep(10)
+        time.sleep(delay)
+        delay = min(delay * 1.7, 15)
     
-    print(f"   ⏳ Timeout waiting for model completion")
-    return False
+    return None
 
 
 def main():
@@ -118,8 +231,12 @@ def main():
     print("📌 Step 1: Connect a Data Source")
     print("=" * 60)
     
-    # 기존 연결 삭제
-    run_query("DROP DATABASE IF EXISTS example_db", "기존 PostgreSQL 연결 삭제")
+    # 기존 리소스 삭제 (서로 독립적이므로 동시에 실행)
+    asyncio.run(run_queries_concurrently([
+        ("DROP DATABASE IF EXISTS example_db", "기존 PostgreSQL 연결 삭제"),
+        ("DROP MODEL IF EXISTS mindsdb.house_sales_model", "기존 모델 삭제"),
+        ("DROP JOB IF EXISTS retrain_model_and_save_predictions", "기존 Job 삭제"),
+    ]))
     
     # PostgreSQL 연결 (로컬 PostgreSQL - robo-postgres)
     connect_query = """
@@ -135,22 +252,27 @@ def main():
     """
     run_query(connect_query.strip(), "PostgreSQL 데이터베이스 연결 (로컬)")
     
-    # 데이터 미리보기
+    # 데이터 미리보기 + 특정 그룹(3 Bedroom House) 시계열을 UNION ALL 한 번의 요청으로 조회
+    # (kind 태그 컬럼으로 결과를 다시 나눔)
     result = run_query(
-        "SELECT * FROM example_db.house_sales LIMIT 10",
-        "house_sales 데이터 미리보기"
+        """(SELECT 'preview' AS kind, saledate, ma, type, bedrooms
+            FROM example_db.house_sales
+            LIMIT 10)
+           UNION ALL
+           (SELECT 'filtered' AS kind, saledate, ma, type, bedrooms
+            FROM example_db.house_sales
+            WHERE type='house' AND bedrooms=3
+            ORDER BY saledate)""",
+        "house_sales 데이터 미리보기 / 3 Bedroom House 시계열 데이터 확인"
     )
-    format_table(result)
     
-    # 특정 그룹 데이터 확인
-    result = run_query(
-        """SELECT saledate, ma, type, bedrooms
-           FROM example_db.house_sales
-           WHERE type='house' AND bedrooms=3
-           ORDER BY saledate""",
-        "3 Bedroom House 시계열 데이터 확인"
-    )
-    format_table(result)
+    by_kind = split_result(result, "kind")
+    for kind, title in (("preview", "house_sales 데이터 미리보기"), ("filtered", "3 Bedroom House 시계열 데이터")):
+        print(f"\n🔹 {title}")
+        if kind in by_kind:
+            format_table(by_kind[kind])
+        elif result and result.get("type") == "table":
+            print("   (No data)")
     
     print("\n✅ Step 1 완료: 데이터 소스 연결 완료!")
     
@@ -161,9 +283,6 @@ def main():
     print("📌 Step 2: Deploy and Train an ML Model")
     print("=" * 60)
     
-    # 기존 모델 삭제
-    run_query("DROP MODEL IF EXISTS mindsdb.house_sales_model", "기존 모델 삭제")
-    
     # 시계열 예측 모델 생성
     # WINDOW 8 = 과거 2년 (8분기) 참조
     # HORIZON 4 = 미래 1년 (4분기) 예측
@@ -179,34 +298,12 @@ def main():
     """
     run_query(model_query.strip(), "시계열 예측 모델 생성 (WINDOW=8, HORIZON=4)")
     
-    # 모델 상태 확인
-    print("\n   ⏳ 모델 훈련 중... (몇 분 소요될 수 있습니다)")
-    
-    for i in range(30):  # 최대 5분 대기
-        time.sleep(10)
-        result = run_query("DESCRIBE house_sales_model", "")
-        
-        if result and result.get("type") == "table" and result.get("data"):
-            # 데이터 구조에 따라 상태 추출
-            data = result["data"][0]
-            status = None
-            
-            # 상태 필드 찾기
-            columns = result.get("column_names", [])
-            if "STATUS" in columns:
-                status_idx = columns.index("STATUS")
-                status = data[status_idx]
-            elif len(data) > 1:
-                status = data[1]  # 두 번째 컬럼이 보통 상태
-            
-            print(f"   🔄 Model Status: {status}")
-            
-            if status and status.lower() == "complete":
-                print("\n   ✅ 모델 훈련 완료!")
-                break
-            elif status and status.lower() == "error":
-                print("\n   ❌ 모델 훈련 실패!")
-                break
+    # 모델 상태 확인 (몇 분 소요될 수 있음)
+    status = check_model_status("house_sales_model", max_wait=300)  # 최대 5분 대기
+    if status == "complete":
+        print("\n   ✅ 모델 훈련 완료!")
+    elif status == "error":
+        print("\n   ❌ 모델 훈련 실패!")
     else:
         print("\n   ⏳ 모델 훈련이 아직 진행 중입니다. 나중에 다시 확인하세요.")
     
@@ -219,44 +316,30 @@ def main():
     print("📌 Step 3: Make Predictions")
     print("=" * 60)
     
-    # LATEST 키워드를 사용한 예측 - 2 bedroom house
-    predict_query = """
-    SELECT m.saledate as date, m.ma as forecast
-    FROM mindsdb.house_sales_model as m
-    JOIN example_db.house_sales as t
-    WHERE t.saledate > LATEST
-    AND t.type = 'house'
-    AND t.bedrooms = 2
-    LIMIT 4
-    """
-    result = run_query(predict_query.strip(), "2 Bedroom House 예측 (다음 4분기)")
-    format_table(result)
-    
-    # 3 bedroom house 예측
-    predict_query_3br = """
-    SELECT m.saledate as date, m.ma as forecast
-    FROM mindsdb.house_sales_model as m
-    JOIN example_db.house_sales as t
-    WHERE t.saledate > LATEST
-    AND t.type = 'house'
-    AND t.bedrooms = 3
-    LIMIT 4
-    """
-    result = run_query(predict_query_3br.strip(), "3 Bedroom House 예측 (다음 4분기)")
-    format_table(result)
-    
-    # Unit 1 bedroom 예측
-    predict_query_unit = """
-    SELECT m.saledate as date, m.ma as forecast
+    # LATEST 키워드를 사용한 예측 - 세 그룹을 UNION ALL 한 번의 요청으로 조회
+    # (segment 태그 컬럼으로 결과를 다시 그룹별로 나눔)
+    segments = [
+        ("2br_house", "house", 2, "2 Bedroom House 예측 (다음 4분기)"),
+        ("3br_house", "house", 3, "3 Bedroom House 예측 (다음 4분기)"),
+        ("1br_unit", "unit", 1, "1 Bedroom Unit 예측 (다음 4분기)"),
+    ]
+    predict_query = "\nUNION ALL\n".join(f"""
+    (SELECT '{segment}' AS segment, m.saledate as date, m.ma as forecast
     FROM mindsdb.house_sales_model as m
     JOIN example_db.house_sales as t
     WHERE t.saledate > LATEST
-    AND t.type = 'unit'
-    AND t.bedrooms = 1
-    LIMIT 4
-    """
-    result = run_query(predict_query_unit.strip(), "1 Bedroom Unit 예측 (다음 4분기)")
-    format_table(result)
+    AND t.type = '{house_type}'
+    AND t.bedrooms = {bedrooms}
+    LIMIT 4)""" for segment, house_type, bedrooms, _ in segments)
+    result = run_query(predict_query.strip(), "그룹별 예측 (2BR House / 3BR House / 1BR Unit)")
+    
+    by_segment = split_result(result, "segment")
+    for segment, _, _, title in segments:
+        print(f"\n🔹 {title}")
+        if segment in by_segment:
+            format_table(by_segment[segment])
+        elif result and result.get("type") == "table":
+            print("   (No data)")
     
     print("\n✅ Step 3 완료: 예측 수행!")
     
@@ -267,9 +350,6 @@ def main():
     print("📌 Step 4: Automate Continuous Improvement")
     print("=" * 60)
     
-    # 기존 Job 삭제
-    run_query("DROP JOB IF EXISTS retrain_model_and_save_predictions", "기존 Job 삭제")
-    
     # 자동 재훈련 Job 생성
     job_query = """
     CREATE JOB retrain_model_and_save_predictions (
@@ -8,6 +8,7 @@ https://docs.mindsdb.com/quickstart-tutorial
 3. Respond - AI 에이전트로 질문 응답
 """
 
+import asyncio
 import mindsdb_sdk
 import time
 import os
@@ -15,8 +16,67 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# OpenAI API 키 (.env에서 로드)
+# OpenAI API 키 (.env에서 로드) - 없으면 "None"이 쿼리에 들어가 KB/에이전트 생성이 뒤늦게 실패하므로 바로 종료
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+if not OPENAI_API_KEY:
+    raise SystemExit("OPENAI_API_KEY is not set - add it to .env or the environment")
+
+# 생성 쿼리는 모듈 로드 시 한 번만 만듦 (단계 함수는 완성된 쿼리만 실행, 키는 위 검사를 통과한 값만 사용)
+KB_CREATE_SQL = f"""
+CREATE KNOWLEDGE_BASE my_kb
+USING
+    embedding_model = {{
+        "provider": "openai",
+        "model_name" : "text-embedding-3-large",
+        "api_key": "{OPENAI_API_KEY}"
+    }},
+    reranking_model = {{
+        "provider": "openai",
+        "model_name": "gpt-4o",
+        "api_key": "{OPENAI_API_KEY}"
+    }},
+    content_columns = ['content']
+"""
+
+AGENT_CREATE_SQL = f"""
+CREATE AGENT my_agent
+USING
+    model = {{
+        "provider": "openai",
+        "model_name" : "gpt-4o",
+        "api_key": "{OPENAI_API_KEY}"
+    }},
+    data = {{
+         "knowledge_bases": ["mindsdb.my_kb"],
+         "tables": ["mysql_demo_db.home_rentals"]
+    }},
+    prompt_template = 'mindsdb.my_kb stores data about mindsdb and home rentals,
+                      mysql_demo_db.home_rentals stores data about home rentals'
+"""
+
+# Knowledge Base INSERT를 나눠 보낼 행 수 / 동시에 보낼 청크 수
+# (한 번의 거대한 임베딩 요청 대신 청크 단위로 겹쳐 처리, 요청당 메모리 상한)
+KB_INSERT_CHUNK_SIZE = int(os.getenv("KB_INSERT_CHUNK_SIZE", "25"))
+KB_INSERT_CONCURRENCY = 4
+
+
+async def insert_in_chunks(server, insert_query, total_rows, chunk_size=KB_INSERT_CHUNK_SIZE,
+                           concurrency=KB_INSERT_CONCURRENCY):
+    """
+    LIMIT/OFFSET 자리({limit}, {offset})가 있는 INSERT 쿼리를 chunk_size 행씩 나눠 동시에 실행
+    
+    mindsdb_sdk는 동기 API이므로 각 청크를 스레드에서 실행하고, 동시 실행 수는 concurrency로 제한합니다.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    
+    async def insert_chunk(offset):
+        async with sem:
+            query = insert_query.format(limit=min(chunk_size, total_rows - offset), offset=offset)
+            await asyncio.to_thread(lambda: server.query(query).fetch())
+            print(f"  - {offset + 1}~{min(offset + chunk_size, total_rows)}/{total_rows} 삽입 완료")
+    
+    await asyncio.gather(*(insert_chunk(offset) for offset in range(0, total_rows, chunk_size)))
+
 
 def connect_to_mindsdb():
     """MindsDB 서버에 연결"""
@@ -145,22 +205,7 @@ def step2_unify(server):
         except:
             pass
         
-        kb_query = f"""
-        CREATE KNOWLEDGE_BASE my_kb
-        USING
-            embedding_model = {{
-                "provider": "openai",
-                "model_name" : "text-embedding-3-large",
-                "api_key": "{OPENAI_API_KEY}"
-            }},
-            reranking_model = {{
-                "provider": "openai",
-                "model_name": "gpt-4o",
-                "api_key": "{OPENAI_API_KEY}"
-            }},
-            content_columns = ['content']
-        """
-        server.query(kb_query)
+        server.query(KB_CREATE_SQL)
         print("✅ Knowledge Base 'my_kb'가 생성되었습니다!")
         
     except Exception as e:
@@ -182,9 +227,10 @@ def step2_unify(server):
                 'rental_price: ' || rental_price
                     AS content
             FROM mysql_demo_db.home_rentals
-            LIMIT 100
+            ORDER BY neighborhood, location, sqft, rental_price, number_of_rooms, number_of_bathrooms
+            LIMIT {limit} OFFSET {offset}
         """
-        server.query(insert_query)
+        asyncio.run(insert_in_chunks(server, insert_query, total_rows=100))
         print("✅ home_rentals 데이터가 삽입되었습니다!")
     except Exception as e:
         print(f"⚠️ 데이터 삽입 오류: {e}")
@@ -249,22 +295,7 @@ def step3_respond(server):
         except:
             pass
         
-        agent_query = f"""
-        CREATE AGENT my_agent
-        USING
-            model = {{
-                "provider": "openai",
-                "model_name" : "gpt-4o",
-                "api_key": "{OPENAI_API_KEY}"
-            }},
-            data = {{
-                 "knowledge_bases": ["mindsdb.my_kb"],
-                 "tables": ["mysql_demo_db.home_rentals"]
-            }},
-            prompt_template = 'mindsdb.my_kb stores data about mindsdb and home rentals,
-                              mysql_demo_db.home_rentals stores data about home rentals'
-        """
-        server.query(agent_query)
+        server.query(AGENT_CREATE_SQL)
         print("✅ AI 에이전트 'my_agent'가 생성되었습니다!")
         
     except Exception as e:
@@ -1,10 +1,20 @@
 """
 MindsDB Quickstart Tutorial - HTTP API Version
 https://docs.mindsdb.com/quickstart-tutorial
+
+환경 변수:
+  MINDSDB_POOL_SIZE    - MindsDB HTTP 연결 풀 크기 (기본 10). 동시에 실행하는 쿼리 수보다 작으면
+                         남는 쿼리가 연결을 기다리며 직렬화되므로 최소 동시 쿼리 수 이상으로 설정
+  KB_INSERT_CHUNK_SIZE - Knowledge Base INSERT 청크 크기 (기본 25)
 """
 
+import asyncio
+import aiohttp
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import sys
 import time
 import os
 from dotenv import load_dotenv
@@ -12,23 +22,44 @@ from dotenv import load_dotenv
 load_dotenv()
 
 BASE_URL = "http://127.0.0.1:47334/api/sql/query"
+# 연결 자체는 몇 초 안에 끝나야 하므로 연결/읽기 타임아웃을 분리 (죽은 서버는 바로 실패)
+CONNECT_TIMEOUT = 3.05
+
+# MindsDB HTTP 연결 풀 크기 - 동시 실행(run_queries_concurrently)하는 쿼리 수 이상으로 설정
+POOL_SIZE = int(os.getenv("MINDSDB_POOL_SIZE", "10"))
+
+# 모든 쿼리가 같은 keep-alive 연결을 재사용하도록 세션 공유 (쿼리마다 TCP 연결/해제 방지)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=POOL_SIZE,
+    pool_maxsize=POOL_SIZE,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+SESSION.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Knowledge Base INSERT를 나눠 보낼 행 수 / 동시에 보낼 청크 수
+# (한 번의 거대한 임베딩 요청 대신 청크 단위로 겹쳐 처리, 요청당 메모리 상한)
+KB_INSERT_CHUNK_SIZE = int(os.getenv("KB_INSERT_CHUNK_SIZE", "25"))
+KB_INSERT_CONCURRENCY = 4
+
 
-def run_query(query, description=""):
+def run_query(query, description="", timeout=120):
     """Execute SQL query via MindsDB HTTP API"""
     if description:
         print(f"\n🔹 {description}")
     print(f"   Query: {query[:100]}..." if len(query) > 100 else f"   Query: {query}")
     
     try:
-        response = requests.post(
+        # stream=True: 본문을 소켓에서 바로 bytes로 읽어 orjson에 전달 (중간 버퍼 복사 없음)
+        with SESSION.post(
             BASE_URL,
-            headers={"Content-Type": "application/json"},
-            json={"query": query},
-            timeout=120
-        )
-        result = response.json()
+            data=orjson.dumps({"query": query}),
+            timeout=(CONNECT_TIMEOUT, timeout),
+            stream=True
+        ) as response:
+            result = orjson.loads(response.raw.read(decode_content=True))
         
         if result.get("type") == "error":
             print(f"   ❌ Error: {result.get('error_message', 'Unknown error')}")
@@ -44,6 +75,64 @@ def run_query(query, description=""):
         return None
 
 
+async def run_query_async(session, query, description="", timeout=120):
+    """
+    run_query의 aiohttp 버전 (서로 의존하지 않는 쿼리를 asyncio.gather로 동시에 실행할 때 사용)
+    
+    동시에 실행되는 쿼리의 출력이 섞이지 않도록 결과까지 모아서 한 번에 출력합니다.
+    """
+    lines = [f"\n🔹 {description}"] if description else []
+    lines.append(f"   Query: {query[:100]}..." if len(query) > 100 else f"   Query: {query}")
+    
+    try:
+        async with session.post(
+            BASE_URL,
+            data=orjson.dumps({"query": query}),
+            timeout=aiohttp.ClientTimeout(connect=CONNECT_TIMEOUT, sock_read=timeout)
+        ) as response:
+            result = orjson.loads(await response.read())
+        
+        if result.get("type") == "error":
+            lines.append(f"   ❌ Error: {result.get('error_message', 'Unknown error')}")
+            result = None
+        elif result.get("type") == "table":
+            lines.append(f"   ✅ Success! Rows: {len(result.get('data', []))}")
+        else:
+            lines.append(f"   ✅ OK")
+        return result
+    except Exception as e:
+        lines.append(f"   ❌ Exception: {e}")
+        return None
+    finally:
+        print("\n".join(lines))
+
+
+async def run_queries_concurrently(queries, timeout=120, concurrency=None):
+    """
+    (query, description) 목록을 한 aiohttp 세션에서 동시에 실행 - 결과는 입력 순서대로 반환
+    
+    concurrency를 지정하면 동시에 실행되는 쿼리 수를 그 값으로 제한합니다.
+    """
+    sem = asyncio.Semaphore(concurrency or max(len(queries), 1))
+    
+    async def bounded(session, query, description):
+        async with sem:
+            return await run_query_async(session, query, description, timeout)
+    
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=POOL_SIZE),
+        headers={"Content-Type": "application/json"},
+        timeout=aiohttp.ClientTimeout(connect=CONNECT_TIMEOUT, sock_read=timeout)
+    ) as session:
+        return await asyncio.gather(*(
+            bounded(session, query, description) for query, description in queries
+        ))
+
+
+# tuple(column_names) -> (헤더 줄, 구분선) - 같은 컬럼 구성의 표를 여러 번 출력할 때 재사용
+_HEADER_CACHE = {}
+
+
 def format_table(result):
     """Format table result for display"""
     if not result or result.get("type") != "table":
@@ -56,16 +145,19 @@ def format_table(result):
         print("   (No data)")
         return
     
-    # Print header
-    print("\n   " + " | ".join(str(c)[:20] for c in columns))
-    print("   " + "-" * (22 * len(columns)))
-    
-    # Print rows (max 5)
-    for row in data[:5]:
-        print("   " + " | ".join(str(v)[:20] for v in row))
+    # 헤더/구분선/행(최대 5개)을 모아 한 번에 출력 (행마다 print하지 않음)
+    key = tuple(columns)
+    cached = _HEADER_CACHE.get(key)
+    if cached is None:
+        header = "   " + " | ".join(str(c)[:20] for c in columns)
+        # 구분선은 실제 헤더 길이에 맞춤 (짧은 컬럼명에서 선이 표보다 길어지지 않도록)
+        cached = _HEADER_CACHE[key] = (header, "   " + "-" * (len(header) - 3))
+    lines = ["", *cached]
+    lines.extend("   " + " | ".join(str(v)[:20] for v in row) for row in data[:5])
     
     if len(data) > 5:
-        print(f"   ... and {len(data) - 5} more rows")
+        lines.append(f"   ... and {len(data) - 5} more rows")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -83,9 +175,15 @@ def main():
     print("📌 Step 1: Connect - 데이터 소스 연결")
     print("=" * 60)
     
-    # 1-1. MySQL 데모 데이터베이스 연결
-    run_query("DROP DATABASE IF EXISTS mysql_demo_db", "기존 MySQL 연결 삭제")
+    # 기존 리소스 삭제 (서로 독립적이므로 동시에 실행)
+    asyncio.run(run_queries_concurrently([
+        ("DROP DATABASE IF EXISTS mysql_demo_db", "기존 MySQL 연결 삭제"),
+        ("DROP DATABASE IF EXISTS my_web", "기존 웹 크롤러 삭제"),
+        ("DROP KNOWLEDGE_BASE IF EXISTS my_kb", "기존 Knowledge Base 삭제"),
+        ("DROP AGENT IF EXISTS my_agent", "기존 에이전트 삭제 시도"),
+    ]))
     
+    # 1-1. MySQL 데모 데이터베이스 연결
     mysql_query = """
     CREATE DATABASE mysql_demo_db
     WITH ENGINE = 'mysql',
@@ -107,7 +205,6 @@ def main():
     format_table(result)
     
     # 1-2. 웹 크롤러 연결
-    run_query("DROP DATABASE IF EXISTS my_web", "기존 웹 크롤러 삭제")
     run_query("CREATE DATABASE my_web WITH ENGINE = 'web'", "웹 크롤러 연결")
     
     print("\n✅ Step 1 완료: 데이터 소스 연결 완료!")
@@ -120,8 +217,6 @@ def main():
     print("=" * 60)
     
     # Knowledge Base 생성
-    run_query("DROP KNOWLEDGE_BASE IF EXISTS my_kb", "기존 Knowledge Base 삭제")
-    
     kb_query = f"""
     CREATE KNOWLEDGE_BASE my_kb
     USING
@@ -139,7 +234,7 @@ def main():
     """
     run_query(kb_query.strip(), "Knowledge Base 생성")
     
-    # 데이터 삽입
+    # 데이터 삽입 (KB_INSERT_CHUNK_SIZE 행씩 나눠 동시에 삽입 - OFFSET이 안정적이도록 정렬)
     insert_query = """
     INSERT INTO my_kb
         SELECT
@@ -151,9 +246,17 @@ def main():
             ', price: $' || CAST(rental_price AS VARCHAR)
                 AS content
         FROM mysql_demo_db.home_rentals
-        LIMIT 50
+        ORDER BY neighborhood, location, sqft, rental_price, number_of_rooms, number_of_bathrooms
+        LIMIT {limit} OFFSET {offset}
     """
-    run_query(insert_query.strip(), "home_rentals 데이터 50개 삽입")
+    total_rows = 50
+    asyncio.run(run_queries_concurrently([
+        (
+            insert_query.format(limit=min(KB_INSERT_CHUNK_SIZE, total_rows - offset), offset=offset).strip(),
+            f"home_rentals 데이터 삽입 ({offset + 1}~{min(offset + KB_INSERT_CHUNK_SIZE, total_rows)}/{total_rows})"
+        )
+        for offset in range(0, total_rows, KB_INSERT_CHUNK_SIZE)
+    ], concurrency=KB_INSERT_CONCURRENCY))
     
     print("\n   ⏳ 인덱싱 대기 중 (5초)...")
     time.sleep(5)
@@ -174,9 +277,6 @@ def main():
     print("📌 Step 3: Respond - AI 에이전트 생성")
     print("=" * 60)
     
-    # 기존 에이전트 삭제 시도 (오류 무시)
-    run_query("DROP AGENT IF EXISTS my_agent", "기존 에이전트 삭제 시도")
-    
     # 에이전트 생성
     agent_query = f"""
     CREATE AGENT my_agent
@@ -203,12 +303,13 @@ def main():
         "What is the average rental price in berkeley_hills?"
     ]
     
-    for q in questions:
+    # 질문끼리는 독립적이므로 동시에 보내고 (전체 대기 시간 = 가장 느린 응답), 출력은 질문 순서대로
+    results = asyncio.run(run_queries_concurrently([
+        (f"SELECT * FROM my_agent WHERE question = '{q}'", "") for q in questions
+    ]))
+    
+    for q, result in zip(questions, results):
         print(f"\n   ❓ Question: {q}")
-        result = run_query(
-            f"SELECT * FROM my_agent WHERE question = '{q}'",
-            ""
-        )
         if result and result.get("type") == "table" and result.get("data"):
             answer = result["data"][0][0] if result["data"][0] else "No answer"
             print(f"   💡 Answer: {str(answer)[:500]}...")